@@ -1,5 +1,7 @@
 """Application configuration using Pydantic settings."""
 
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -9,6 +11,8 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
+        # Shared process-wide via get_settings(); never mutated after load
+        frozen=True,
     )
 
     app_name: str = "Market Data Service"
@@ -17,13 +21,42 @@ class Settings(BaseSettings):
     host: str = "127.0.0.1"  # Use HOST=0.0.0.0 in Docker/production
     port: int = 8000
     log_level: str = "INFO"
+    # Interactive API docs (/docs, /redoc, /openapi.json); disable in production workers
+    enable_docs: bool = True
+    enable_cors: bool = True
 
     # Redis configuration
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_db: int = 0
+    redis_max_connections: int = 32
     # Cache duration for metadata (1 month in seconds, as metadata rarely changes)
     cache_expire_seconds: int = 60 * 60 * 24 * 30
-
-
-settings = Settings()
+    # Cache duration for rendered search responses (bounds staleness of served bodies)
+    search_cache_expire_seconds: int = 60 * 60 * 24
+    # Cache duration for ISINs with no match anywhere
+    search_miss_expire_seconds: int = 60 * 60
+    # Cache duration for quotes (short, prices move constantly)
+    quote_cache_expire_seconds: int = 60
+    # How long the last known quote is kept to serve when Yahoo Finance fails
+    quote_stale_expire_seconds: int = 60 * 60 * 24
+    # Worker threads for blocking upstream calls (yfinance, justETF)
+    yfinance_max_workers: int = 16
+    # Upstream calls in flight per batch request
+    batch_concurrency: int = 8
+    # In-process cache in front of Redis for hot ISINs/symbols
+    local_cache_maxsize: int = 4096
+    local_cache_ttl_seconds: int = 60
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, built on first access."""
+    return Settings()
+
+
+def __getattr__(name: str) -> Settings:
+    """Lazily resolve the legacy module-level `settings` attribute."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,71 +1,109 @@
 """FastAPI application entry point."""
 
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import FastAPI, Request
 
-from src.config import settings
+from src.config import get_settings
 from src.models.schemas import HealthResponse
+from src.responses import ORJSONResponse
 from src.routes import quote, search
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, settings.log_level.upper()),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+logger = logging.getLogger(__name__)
 
-# Silence noisy yfinance logs completely
-logging.getLogger("yfinance").setLevel(logging.CRITICAL)
 
-logger = logging.getLogger(__name__)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Size the default executor that asyncio.to_thread uses for blocking upstream calls."""
+    settings = get_settings()
+    # The loop owns its default executor and shuts it down when it closes
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.yfinance_max_workers, thread_name_prefix="yf")
+    )
+    yield
+
 
-# Create FastAPI app
-app = FastAPI(
-    title=settings.app_name,
-    version=settings.app_version,
-    description="A market data service providing stock quotes and instrument search via Yahoo Finance.",
-    docs_url="/docs",
-    redoc_url="/redoc",
-)
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers
-app.include_router(search.router, prefix="/api/v1")
-app.include_router(quote.router, prefix="/api/v1")
-
-
-@app.get("/health", response_model=HealthResponse, tags=["health"])
 async def health_check() -> HealthResponse:
     """Health check endpoint."""
     return HealthResponse(
         status="healthy",
-        version=settings.app_version,
+        version=get_settings().app_version,
     )
 
 
-@app.get("/", tags=["root"])
-async def root() -> dict:
+async def root(request: Request) -> dict:
     """Root endpoint with API information."""
+    settings = get_settings()
     return {
         "name": settings.app_name,
         "version": settings.app_version,
-        "docs": "/docs",
+        "docs": request.app.docs_url,
         "health": "/health",
     }
 
 
+def create_app() -> FastAPI:
+    """Build the FastAPI application from the current settings."""
+    settings = get_settings()
+
+    # Configure logging
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level.upper()),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    # Silence noisy yfinance logs completely
+    logging.getLogger("yfinance").setLevel(logging.CRITICAL)
+
+    app = FastAPI(
+        title=settings.app_name,
+        version=settings.app_version,
+        description="A market data service providing stock quotes and instrument search via Yahoo Finance.",
+        docs_url="/docs" if settings.enable_docs else None,
+        redoc_url="/redoc" if settings.enable_docs else None,
+        openapi_url="/openapi.json" if settings.enable_docs else None,
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
+    )
+
+    # Add CORS middleware (imported lazily so workers without CORS skip the machinery)
+    if settings.enable_cors:
+        from fastapi.middleware.cors import CORSMiddleware
+
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=["*"],  # Configure appropriately for production
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+
+    # Include routers
+    app.include_router(search.router, prefix="/api/v1")
+    app.include_router(quote.router, prefix="/api/v1")
+
+    app.add_api_route(
+        "/health",
+        health_check,
+        methods=["GET"],
+        response_model=HealthResponse,
+        tags=["health"],
+        include_in_schema=False,
+    )
+    app.add_api_route("/", root, methods=["GET"], tags=["root"])
+    return app
+
+
+app = create_app()
+
+
 if __name__ == "__main__":  # pragma: no cover
     import uvicorn
 
+    settings = get_settings()
     uvicorn.run(
         "src.main:app",
         host=settings.host,
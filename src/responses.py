@@ -0,0 +1,13 @@
+"""Custom response classes for fast JSON serialization."""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib json module."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
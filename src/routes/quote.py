@@ -2,7 +2,7 @@
 
 import logging
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 
 from src.models.schemas import (
     BatchQuoteRequest,
@@ -11,7 +11,9 @@ from src.models.schemas import (
     QuoteErrorItem,
     QuoteResponse,
 )
-from src.services.yahoo_finance import yahoo_finance_service
+from src.responses import ORJSONResponse
+from src.services.fallback_providers import quote_cache
+from src.services.yahoo_finance import coalesce, yahoo_finance_service
 
 logger = logging.getLogger(__name__)
 
@@ -20,15 +22,16 @@ router = APIRouter(prefix="/quote", tags=["quote"])
 
 @router.get(
     "/{symbol}",
-    response_model=QuoteResponse,
+    response_model=None,
     responses={
+        200: {"model": QuoteResponse, "description": "Quote found"},
         404: {"model": ErrorResponse, "description": "Quote not found"},
         500: {"model": ErrorResponse, "description": "Internal server error"},
     },
     summary="Get quote by symbol",
     description="Get current price quote for a trading symbol.",
 )
-async def get_quote(symbol: str) -> QuoteResponse:
+async def get_quote(symbol: str) -> QuoteResponse | Response:
     """
     Get current quote for a trading symbol.
 
@@ -39,10 +42,17 @@ async def get_quote(symbol: str) -> QuoteResponse:
         QuoteResponse with current price data.
 
     Raises:
-        HTTPException: 404 if quote not found, 500 on error.
+        HTTPException: 404 if quote not found, 500 on error with no stale quote cached.
     """
     try:
-        result = yahoo_finance_service.get_quote(symbol)
+        # Cache hits are stored pre-rendered; send the bytes without re-serializing
+        cached = await quote_cache.get(symbol)
+        if cached:
+            return Response(content=cached, media_type="application/json")
+
+        # Run the blocking yfinance call off the event loop so cache hits keep flowing;
+        # concurrent requests for the same symbol share one upstream call
+        result = await coalesce(("quote", symbol), yahoo_finance_service.get_quote, symbol)
 
         if result is None:
             raise HTTPException(
@@ -50,28 +60,36 @@ async def get_quote(symbol: str) -> QuoteResponse:
                 detail=f"No quote found for symbol: {symbol}",
             )
 
+        await quote_cache.set(symbol, result)
         return result
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get quote for {symbol}: {e}")
+        logger.error("Failed to get quote for %s", symbol, exc_info=True)
+        # Prefer the last known quote over an error while upstream is failing
+        stale = await quote_cache.get_stale(symbol)
+        if stale:
+            return Response(
+                content=stale, media_type="application/json", headers={"X-Cache": "STALE"}
+            )
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to get quote: {str(e)}",
+            detail="Internal server error",
         ) from e
 
 
 @router.post(
     "/batch",
-    response_model=BatchQuoteResponse,
+    response_model=None,
     responses={
+        200: {"model": BatchQuoteResponse, "description": "Batch results"},
         500: {"model": ErrorResponse, "description": "Internal server error"},
     },
     summary="Batch get quotes by symbol",
     description="Get current price quotes for multiple trading symbols in parallel.",
 )
-async def batch_get_quotes(request: BatchQuoteRequest) -> BatchQuoteResponse:
+async def batch_get_quotes(request: BatchQuoteRequest) -> ORJSONResponse:
     """
     Get quotes for multiple trading symbols.
 
@@ -84,13 +102,19 @@ async def batch_get_quotes(request: BatchQuoteRequest) -> BatchQuoteResponse:
     try:
         results, errors = await yahoo_finance_service.batch_get_quotes(request.symbols)
 
-        error_items = [QuoteErrorItem(symbol=symbol, error=error) for symbol, error in errors]
+        # Results are already validated by the service layer; skip re-validation
+        error_items = [
+            QuoteErrorItem.model_construct(symbol=symbol, error=error) for symbol, error in errors
+        ]
+
+        payload = BatchQuoteResponse.model_construct(results=results, errors=error_items)
 
-        return BatchQuoteResponse(results=results, errors=error_items)
+        # Render directly to skip FastAPI's jsonable_encoder pass on large batches
+        return ORJSONResponse(content=payload.model_dump(mode="json"))
 
     except Exception as e:
-        logger.error(f"Failed to perform batch quote: {e}")
+        logger.error("Failed to perform batch quote", exc_info=True)
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to perform batch quote: {str(e)}",
+            detail="Internal server error",
         ) from e
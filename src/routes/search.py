@@ -2,7 +2,7 @@
 
 import logging
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 
 from src.models.schemas import (
     BatchSearchRequest,
@@ -11,7 +11,9 @@ from src.models.schemas import (
     InstrumentResponse,
     SearchErrorItem,
 )
-from src.services.yahoo_finance import yahoo_finance_service
+from src.responses import ORJSONResponse
+from src.services.fallback_providers import metadata_cache
+from src.services.yahoo_finance import coalesce, yahoo_finance_service
 
 logger = logging.getLogger(__name__)
 
@@ -20,15 +22,16 @@ router = APIRouter(prefix="/search", tags=["search"])
 
 @router.get(
     "/{isin}",
-    response_model=InstrumentResponse,
+    response_model=None,
     responses={
+        200: {"model": InstrumentResponse, "description": "Instrument found"},
         404: {"model": ErrorResponse, "description": "Instrument not found"},
         500: {"model": ErrorResponse, "description": "Internal server error"},
     },
     summary="Search instrument by ISIN",
     description="Search for a financial instrument using its ISIN code.",
 )
-async def search_by_isin(isin: str) -> InstrumentResponse:
+async def search_by_isin(isin: str) -> InstrumentResponse | Response:
     """
     Search for an instrument by its ISIN code.
 
@@ -42,7 +45,14 @@ async def search_by_isin(isin: str) -> InstrumentResponse:
         HTTPException: 404 if instrument not found, 500 on error.
     """
     try:
-        result = yahoo_finance_service.search_by_isin(isin)
+        # Cache hits are stored pre-rendered; send the bytes without re-serializing
+        cached = await metadata_cache.get_response(isin)
+        if cached:
+            return Response(content=cached, media_type="application/json")
+
+        # Run the blocking lookup off the event loop; concurrent requests for the same
+        # ISIN share one upstream call
+        result = await coalesce(("search", isin), yahoo_finance_service.search_by_isin, isin)
 
         if result is None:
             raise HTTPException(
@@ -50,28 +60,30 @@ async def search_by_isin(isin: str) -> InstrumentResponse:
                 detail=f"No instrument found for ISIN: {isin}",
             )
 
+        await metadata_cache.set_response(isin, result)
         return result
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to search for ISIN {isin}: {e}")
+        logger.error("Failed to search for ISIN %s", isin, exc_info=True)
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to search for instrument: {str(e)}",
+            detail="Internal server error",
         ) from e
 
 
 @router.post(
     "/batch",
-    response_model=BatchSearchResponse,
+    response_model=None,
     responses={
+        200: {"model": BatchSearchResponse, "description": "Batch results"},
         500: {"model": ErrorResponse, "description": "Internal server error"},
     },
     summary="Batch search instruments by ISIN",
     description="Search for multiple financial instruments using their ISIN codes in parallel.",
 )
-async def batch_search_by_isins(request: BatchSearchRequest) -> BatchSearchResponse:
+async def batch_search_by_isins(request: BatchSearchRequest) -> ORJSONResponse:
     """
     Search for multiple instruments by their ISIN codes.
 
@@ -84,13 +96,19 @@ async def batch_search_by_isins(request: BatchSearchRequest) -> BatchSearchRespo
     try:
         results, errors = await yahoo_finance_service.batch_search_by_isins(request.isins)
 
-        error_items = [SearchErrorItem(isin=isin, error=error) for isin, error in errors]
+        # Results are already validated by the service layer; skip re-validation
+        error_items = [
+            SearchErrorItem.model_construct(isin=isin, error=error) for isin, error in errors
+        ]
+
+        payload = BatchSearchResponse.model_construct(results=results, errors=error_items)
 
-        return BatchSearchResponse(results=results, errors=error_items)
+        # Render directly to skip FastAPI's jsonable_encoder pass on large batches
+        return ORJSONResponse(content=payload.model_dump(mode="json"))
 
     except Exception as e:
-        logger.error(f"Failed to perform batch search: {e}")
+        logger.error("Failed to perform batch search", exc_info=True)
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to perform batch search: {str(e)}",
+            detail="Internal server error",
         ) from e
@@ -1,22 +1,52 @@
 """Fallback providers for instrument lookup when primary source fails."""
 
-import json
 import logging
 import re
+import threading
+import time
 from abc import ABC, abstractmethod
 from datetime import UTC, datetime, timedelta
-from typing import NamedTuple
 
+import msgspec
 import redis
+import redis.asyncio
 import requests
-from bs4 import BeautifulSoup
+from cachetools import TLRUCache, TTLCache
+from lxml.etree import XPath
+from lxml.html import HtmlElement, document_fromstring
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from src.config import settings
+from src.config import get_settings
+from src.models.schemas import InstrumentResponse, QuoteResponse
 
 logger = logging.getLogger(__name__)
 
+# Ticker patterns on justETF pages, compiled once and tried in order
+_TICKER_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'"ticker"\s*:\s*"([A-Z0-9]+)"',
+        r"Ticker[:\s]+([A-Z0-9]{2,10})\b",
+        r'data-ticker="([A-Z0-9]+)"',
+    )
+]
+_CURRENCY_RE = re.compile(r"\b(EUR|USD|GBP|CHF)\b")
 
-class TickerInfo(NamedTuple):
+# Visible page text only: script/style blobs precede the body and mention other venues/currencies
+_VISIBLE_TEXT = XPath("//text()[not(ancestor::script or ancestor::style or ancestor::template)]")
+
+
+def _visible_text(tree: HtmlElement) -> str:
+    """Flatten the page text, leaving out script, style and template contents."""
+    return " ".join(_VISIBLE_TEXT(tree))
+
+
+class ProviderUnavailableError(Exception):
+    """The provider could not answer (blocked, unreachable or unreadable), as opposed to no match."""
+
+
+class TickerInfo(msgspec.Struct, frozen=True):
     """Ticker information from fallback provider."""
 
     symbol: str
@@ -24,64 +54,322 @@ class TickerInfo(NamedTuple):
     exchange: str
     currency: str
 
-    def to_dict(self):
-        return self._asdict()
 
-    @classmethod
-    def from_dict(cls, data):
-        return cls(**data)
+# Typed C codecs for cached TickerInfo; the JSON wire format is unchanged
+_ticker_encoder = msgspec.json.Encoder()
+_ticker_decoder = msgspec.json.Decoder(TickerInfo)
 
 
 class MetadataCache:
     """Caching service for instrument metadata."""
 
     def __init__(self):
+        settings = get_settings()
+        # In-process layer in front of Redis for hot ISINs, keyed like Redis. Guarded by a
+        # lock because the justETF provider reads it from worker threads.
+        self._local = TTLCache(
+            maxsize=settings.local_cache_maxsize, ttl=settings.local_cache_ttl_seconds
+        )
+        self._local_lock = threading.Lock()
+        pool_kwargs = {
+            "host": settings.redis_host,
+            "port": settings.redis_port,
+            "db": settings.redis_db,
+            "decode_responses": True,
+            "socket_connect_timeout": 2,
+            "socket_keepalive": True,
+            "max_connections": settings.redis_max_connections,
+            "timeout": 2,
+        }
         try:
-            self.redis = redis.Redis(
-                host=settings.redis_host,
-                port=settings.redis_port,
-                db=settings.redis_db,
-                decode_responses=True,
-                socket_connect_timeout=2,
-            )
+            # Bounded keep-alive pool shared by every thread in a batch; blocks instead of
+            # failing when all connections are busy
+            self.redis = redis.Redis(connection_pool=redis.BlockingConnectionPool(**pool_kwargs))
             # Connectivity probe
             self.redis.ping()
+            # Async client for lookups made directly on the event loop (routes, batch prefetch)
+            self.async_redis = redis.asyncio.Redis(
+                connection_pool=redis.asyncio.BlockingConnectionPool(**pool_kwargs)
+            )
             self.enabled = True
             logger.info("Metadata cache (Redis) initialized.")
         except Exception as e:
             logger.warning(f"Redis not available, caching disabled: {e}")
             self.redis = None
+            self.async_redis = None
             self.enabled = False
 
+    def _get_local(self, key: str):
+        with self._local_lock:
+            return self._local.get(key)
+
+    def _set_local(self, key: str, value) -> None:
+        with self._local_lock:
+            self._local[key] = value
+
+    def _invalidate_local(self, key: str) -> None:
+        with self._local_lock:
+            self._local.pop(key, None)
+
     def get(self, isin: str) -> TickerInfo | None:
         if not self.enabled:
             return None
+        key = f"metadata:{isin}"
+        info = self._get_local(key)
+        if info is not None:
+            return info
         try:
-            data = self.redis.get(f"metadata:{isin}")
+            data = self.redis.get(key)
             if data:
-                logger.debug(f"Cache hit for ISIN {isin}")
-                return TickerInfo.from_dict(json.loads(data))
+                logger.debug("Cache hit for ISIN %s", isin)
+                info = _ticker_decoder.decode(data)
+                self._set_local(key, info)
+                return info
         except Exception as e:
             logger.error(f"Error reading from cache: {e}")
         return None
 
+    async def mget(self, isins: list[str]) -> dict[str, TickerInfo]:
+        """Fetch cached metadata for several ISINs in a single round trip."""
+        if not self.enabled or not isins:
+            return {}
+        found: dict[str, TickerInfo] = {}
+        missing: list[str] = []
+        for isin in isins:
+            info = self._get_local(f"metadata:{isin}")
+            if info is not None:
+                found[isin] = info
+            else:
+                missing.append(isin)
+        if not missing:
+            return found
+        try:
+            values = await self.async_redis.mget([f"metadata:{isin}" for isin in missing])
+            for isin, data in zip(missing, values, strict=True):
+                if data:
+                    found[isin] = _ticker_decoder.decode(data)
+                    self._set_local(f"metadata:{isin}", found[isin])
+        except Exception as e:
+            logger.error(f"Error reading batch from cache: {e}")
+        return found
+
     def set(self, isin: str, info: TickerInfo):
         if not self.enabled:
             return
         try:
             self.redis.setex(
                 f"metadata:{isin}",
-                settings.cache_expire_seconds,
-                json.dumps(info.to_dict()),
+                get_settings().cache_expire_seconds,
+                _ticker_encoder.encode(info),
             )
-            logger.debug(f"Cached metadata for ISIN {isin}")
+            self._invalidate_local(f"metadata:{isin}")
+            logger.debug("Cached metadata for ISIN %s", isin)
         except Exception as e:
             logger.error(f"Error writing to cache: {e}")
 
+    async def get_response(self, isin: str) -> str | None:
+        """Return the cached JSON body of a search response, ready to send as-is."""
+        if not self.enabled:
+            return None
+        key = f"metadata:json:{isin}"
+        body = self._get_local(key)
+        if body is not None:
+            return body
+        try:
+            body = await self.async_redis.get(key)
+            if body:
+                self._set_local(key, body)
+            return body
+        except Exception as e:
+            logger.error(f"Error reading response from cache: {e}")
+        return None
+
+    async def set_response(self, isin: str, instrument: InstrumentResponse):
+        if not self.enabled:
+            return
+        try:
+            await self.async_redis.setex(
+                f"metadata:json:{isin}",
+                get_settings().search_cache_expire_seconds,
+                instrument.model_dump_json(),
+            )
+            self._invalidate_local(f"metadata:json:{isin}")
+        except Exception as e:
+            logger.error(f"Error writing response to cache: {e}")
+
+    async def mget_responses(self, isins: list[str]) -> dict[str, str]:
+        """Fetch cached search response bodies for several ISINs in a single round trip."""
+        if not self.enabled or not isins:
+            return {}
+        found: dict[str, str] = {}
+        missing: list[str] = []
+        for isin in isins:
+            body = self._get_local(f"metadata:json:{isin}")
+            if body is not None:
+                found[isin] = body
+            else:
+                missing.append(isin)
+        if not missing:
+            return found
+        try:
+            bodies = await self.async_redis.mget([f"metadata:json:{isin}" for isin in missing])
+            for isin, body in zip(missing, bodies, strict=True):
+                if body:
+                    found[isin] = body
+                    self._set_local(f"metadata:json:{isin}", body)
+        except Exception as e:
+            logger.error(f"Error reading responses batch from cache: {e}")
+        return found
+
+    async def set_responses(self, instruments: dict[str, InstrumentResponse]):
+        """Cache several search responses, keyed by ISIN, in a single pipelined round trip."""
+        if not self.enabled or not instruments:
+            return
+        expire = get_settings().search_cache_expire_seconds
+        try:
+            async with self.async_redis.pipeline(transaction=False) as pipe:
+                for isin, instrument in instruments.items():
+                    pipe.setex(f"metadata:json:{isin}", expire, instrument.model_dump_json())
+                await pipe.execute()
+            for isin in instruments:
+                self._invalidate_local(f"metadata:json:{isin}")
+        except Exception as e:
+            logger.error(f"Error writing responses batch to cache: {e}")
+
 
 metadata_cache = MetadataCache()
 
 
+def _fresh_ttl(quote: QuoteResponse, expire: int) -> int:
+    """Seconds a quote stays fresh, counted from its fetch time rather than from now."""
+    try:
+        age = time.time() - datetime.fromisoformat(quote.time).timestamp()
+    except (TypeError, ValueError):
+        return expire
+    return min(expire, int(expire - age))
+
+
+class QuoteCache:
+    """Short-lived caching service for quotes, sharing the metadata async Redis client."""
+
+    def __init__(self, client: redis.asyncio.Redis | None = None):
+        settings = get_settings()
+        self.redis = client
+        self.enabled = client is not None
+        local_ttl = min(settings.local_cache_ttl_seconds, settings.quote_cache_expire_seconds)
+        # In-process layer for hot symbols; only touched from the event loop, so no lock.
+        # Entries are (body, seconds left on the Redis key), so a copy never outlives its source
+        self._local = TLRUCache(
+            maxsize=settings.local_cache_maxsize,
+            ttu=lambda _key, entry, now: now + min(local_ttl, entry[1]),
+        )
+
+    def _remember(self, symbol: str, data: str, pttl: int) -> None:
+        """Keep a Redis hit locally for at most the key's remaining lifetime."""
+        if pttl > 0:
+            self._local[symbol] = (data, pttl / 1000)
+
+    async def get(self, symbol: str) -> str | None:
+        """Return the cached JSON body of a quote, ready to send as-is."""
+        if not self.enabled:
+            return None
+        entry = self._local.get(symbol)
+        if entry is not None:
+            return entry[0]
+        try:
+            key = f"quote:{symbol}"
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.pttl(key)
+                data, pttl = await pipe.execute()
+            if data:
+                logger.debug("Cache hit for quote %s", symbol)
+                self._remember(symbol, data, pttl)
+                return data
+        except Exception as e:
+            logger.error(f"Error reading quote from cache: {e}")
+        return None
+
+    async def get_stale(self, symbol: str) -> str | None:
+        """Return the last known quote for a symbol, even if it is past its fresh TTL."""
+        if not self.enabled:
+            return None
+        try:
+            return await self.redis.get(f"quote:stale:{symbol}")
+        except Exception as e:
+            logger.error(f"Error reading stale quote from cache: {e}")
+        return None
+
+    async def mget(self, symbols: list[str]) -> dict[str, str]:
+        """Fetch fresh cached quote bodies for several symbols in a single round trip."""
+        if not self.enabled or not symbols:
+            return {}
+        found: dict[str, str] = {}
+        missing: list[str] = []
+        for symbol in symbols:
+            entry = self._local.get(symbol)
+            if entry is not None:
+                found[symbol] = entry[0]
+            else:
+                missing.append(symbol)
+        if not missing:
+            return found
+        try:
+            keys = [f"quote:{symbol}" for symbol in missing]
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.mget(keys)
+                for key in keys:
+                    pipe.pttl(key)
+                values, *pttls = await pipe.execute()
+            for symbol, data, pttl in zip(missing, values, pttls, strict=True):
+                if data:
+                    found[symbol] = data
+                    self._remember(symbol, data, pttl)
+        except Exception as e:
+            logger.error(f"Error reading quote batch from cache: {e}")
+        return found
+
+    async def set(self, symbol: str, quote: QuoteResponse):
+        if not self.enabled:
+            return
+        settings = get_settings()
+        body = quote.model_dump_json()
+        try:
+            # A quote memoized upstream is already partly aged; don't restart its clock
+            ttl = _fresh_ttl(quote, settings.quote_cache_expire_seconds)
+            # Keep a long-lived copy alongside the fresh one to serve during upstream outages
+            async with self.redis.pipeline(transaction=False) as pipe:
+                if ttl > 0:
+                    pipe.setex(f"quote:{symbol}", ttl, body)
+                pipe.setex(f"quote:stale:{symbol}", settings.quote_stale_expire_seconds, body)
+                await pipe.execute()
+            self._local.pop(symbol, None)
+        except Exception as e:
+            logger.error(f"Error writing quote to cache: {e}")
+
+    async def set_many(self, quotes: dict[str, QuoteResponse]):
+        """Cache several quotes, keyed by requested symbol, in a single pipelined round trip."""
+        if not self.enabled or not quotes:
+            return
+        settings = get_settings()
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for symbol, quote in quotes.items():
+                    body = quote.model_dump_json()
+                    ttl = _fresh_ttl(quote, settings.quote_cache_expire_seconds)
+                    if ttl > 0:
+                        pipe.setex(f"quote:{symbol}", ttl, body)
+                    pipe.setex(f"quote:stale:{symbol}", settings.quote_stale_expire_seconds, body)
+                await pipe.execute()
+            for symbol in quotes:
+                self._local.pop(symbol, None)
+        except Exception as e:
+            logger.error(f"Error writing quote batch to cache: {e}")
+
+
+quote_cache = QuoteCache(metadata_cache.async_redis)
+
+
 class BaseDiscoveryProvider(ABC):
     """Interface for alternative instrument discovery providers."""
 
@@ -108,9 +396,24 @@ class JustETFProvider(BaseDiscoveryProvider):
         "Borsa Italiana": ".MI",
         "SIX Swiss Exchange": ".SW",
     }
+    # Single alternation over all exchange names, scanned once per page
+    EXCHANGE_PATTERN = re.compile("|".join(map(re.escape, EXCHANGE_TO_SUFFIX)))
 
     def __init__(self):
         self.session = requests.Session()
+        # Size the keep-alive pool for the executor threads so connections are reused rather
+        # than discarded, and retry transient server errors (never 403, which trips the breaker)
+        pool_size = get_settings().yfinance_max_workers
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=pool_size,
+                max_retries=Retry(
+                    total=2, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504]
+                ),
+            ),
+        )
         self.session.headers.update(
             {
                 "User-Agent": self.USER_AGENT,
@@ -135,6 +438,12 @@ class JustETFProvider(BaseDiscoveryProvider):
         """
         Search for ETF information by ISIN on justETF.
         Checks cache first, then respects Circuit Breaker.
+
+        Returns:
+            TickerInfo if found, None if justETF has no ticker for the ISIN.
+
+        Raises:
+            ProviderUnavailableError: if the breaker is open or the page can't be fetched or parsed.
         """
         # 1. Check Cache
         cached = metadata_cache.get(isin)
@@ -143,8 +452,8 @@ class JustETFProvider(BaseDiscoveryProvider):
 
         # 2. Check Circuit Breaker
         if self._is_blocked():
-            logger.warning(f"JustETF provider is temporarily blocked. Skipping search for {isin}")
-            return None
+            logger.warning("JustETF provider is temporarily blocked. Skipping search for %s", isin)
+            raise ProviderUnavailableError("justETF is temporarily blocked")
 
         # 3. Perform Scraping
         try:
@@ -157,29 +466,33 @@ class JustETFProvider(BaseDiscoveryProvider):
             if response.status_code == 403:
                 logger.error("justETF returned 403. Triping circuit breaker for 10 minutes.")
                 self.blocked_until = datetime.now(UTC) + timedelta(minutes=10)
-                return None
+                raise ProviderUnavailableError("justETF returned 403")
 
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, "html.parser")
+            # Parse with lxml directly; BeautifulSoup over lxml rebuilds the tree in Python
+            tree = document_fromstring(response.text)
 
             # Extract ticker from page
-            ticker = self._extract_ticker(soup, response.text)
+            ticker = self._extract_ticker(tree, response.text)
             if not ticker:
-                logger.warning(f"justETF: No ticker found for ISIN {isin}")
+                logger.info("justETF: No ticker found for ISIN %s", isin)
                 return None
 
             # Extract name from page title or h1
-            name = self._extract_name(soup)
+            name = self._extract_name(tree)
+
+            # Flatten the page text once for the exchange and currency scans
+            text = _visible_text(tree)
 
             # Extract exchange and build Yahoo symbol
-            exchange, suffix = self._extract_exchange(soup)
+            exchange, suffix = self._extract_exchange(tree, text)
             yahoo_symbol = f"{ticker}{suffix}"
 
             # Extract currency
-            currency = self._extract_currency(soup)
+            currency = self._extract_currency(tree, text)
 
-            logger.info(f"justETF: Found {yahoo_symbol} for ISIN {isin}")
+            logger.info("justETF: Found %s for ISIN %s", yahoo_symbol, isin)
 
             info = TickerInfo(
                 symbol=yahoo_symbol,
@@ -193,54 +506,58 @@ class JustETFProvider(BaseDiscoveryProvider):
 
             return info
 
+        except ProviderUnavailableError:
+            raise
         except requests.RequestException as e:
-            logger.warning(f"justETF: Request failed for ISIN {isin}: {e}")
-            return None
+            logger.warning("justETF: Request failed for ISIN %s: %s", isin, e)
+            raise ProviderUnavailableError(str(e)) from e
         except Exception as e:
-            logger.error(f"justETF: Error parsing ISIN {isin}: {e}")
-            return None
+            logger.error("justETF: Error parsing ISIN %s: %s", isin, e)
+            raise ProviderUnavailableError(str(e)) from e
 
-    def _extract_ticker(self, soup: BeautifulSoup, html: str) -> str | None:
+    def _extract_ticker(self, tree: HtmlElement, html: str) -> str | None:
         """Extract ticker symbol from the page."""
-        ticker_patterns = [
-            r'"ticker"\s*:\s*"([A-Z0-9]+)"',
-            r"Ticker[:\s]+([A-Z0-9]{2,10})\b",
-            r'data-ticker="([A-Z0-9]+)"',
-        ]
-
-        for pattern in ticker_patterns:
-            match = re.search(pattern, html, re.IGNORECASE)
+        for pattern in _TICKER_PATTERNS:
+            match = pattern.search(html)
             if match:
                 return match.group(1).upper()
 
         return None
 
-    def _extract_name(self, soup: BeautifulSoup) -> str | None:
+    def _extract_name(self, tree: HtmlElement) -> str | None:
         """Extract ETF name from the page."""
-        h1 = soup.find("h1")
-        if h1:
-            return h1.get_text(strip=True)
+        h1 = tree.find(".//h1")
+        if h1 is not None:
+            return h1.text_content().strip()
 
-        title = soup.find("title")
-        if title:
-            text = title.get_text(strip=True)
+        title = tree.find(".//title")
+        if title is not None:
+            text = title.text_content().strip()
             return text.split("|")[0].strip()
 
         return None
 
-    def _extract_exchange(self, soup: BeautifulSoup) -> tuple[str | None, str]:
+    def _extract_exchange(
+        self, tree: HtmlElement, text: str | None = None
+    ) -> tuple[str | None, str]:
         """Extract exchange and determine Yahoo suffix."""
-        for exchange_name, suffix in self.EXCHANGE_TO_SUFFIX.items():
-            if soup.find(string=lambda t, en=exchange_name: t and en in t):
-                return exchange_name, suffix
+        if text is None:
+            text = _visible_text(tree)
+
+        found = set(self.EXCHANGE_PATTERN.findall(text))
+        if found:
+            # Respect EXCHANGE_TO_SUFFIX order when several exchanges are listed
+            for exchange_name, suffix in self.EXCHANGE_TO_SUFFIX.items():
+                if exchange_name in found:
+                    return exchange_name, suffix
 
         return None, ".L"
 
-    def _extract_currency(self, soup: BeautifulSoup) -> str | None:
+    def _extract_currency(self, tree: HtmlElement, text: str | None = None) -> str | None:
         """Extract trading currency from the page."""
-        currency_pattern = r"\b(EUR|USD|GBP|CHF)\b"
-        text = soup.get_text()
-        match = re.search(currency_pattern, text)
+        if text is None:
+            text = _visible_text(tree)
+        match = _CURRENCY_RE.search(text)
         return match.group(1) if match else None
 
 
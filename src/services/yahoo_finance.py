@@ -1,32 +1,30 @@
 import asyncio
 import logging
-import math
 import re
-from datetime import UTC, datetime
-
+import threading
+import time
+from collections.abc import Mapping
+from datetime import UTC, datetime, timedelta
+from types import MappingProxyType
+from typing import Final
+
+import orjson
 import yfinance as yf
+from cachetools import TTLCache
+from curl_cffi.requests import exceptions as curl_exceptions
+from yfinance.exceptions import YFRateLimitError
 
+from src.config import get_settings
 from src.models.schemas import InstrumentResponse, QuoteResponse
-from src.services.fallback_providers import justetf_provider
+from src.services import fallback_providers
+from src.services.fallback_providers import TickerInfo, justetf_provider
 
 logger = logging.getLogger(__name__)
 
 
-def is_valid_isin(isin: str) -> bool:
-    """
-    Validate ISIN code format (ISO 6166).
-    Standard: 2 letters, 9 alphanumeric characters, 1 check digit.
-    """
-    if not isin:
-        return False
-    return bool(re.match(r"^[A-Z]{2}[A-Z0-9]{9}\d$", isin.upper()))
-
-
-class YahooFinanceService:
-    """Service class to interact with Yahoo Finance via yfinance library."""
-
-    # Mapping of exchange suffixes to full names
-    EXCHANGE_MAP = {
+# Mapping of exchange suffixes to full names (read-only, shared by all lookups)
+_EXCHANGE_MAP: Final[Mapping[str, str]] = MappingProxyType(
+    {
         "L": "London Stock Exchange",
         "DE": "Deutsche Börse",
         "PA": "Euronext Paris",
@@ -43,9 +41,125 @@ class YahooFinanceService:
         "SS": "Shanghai Stock Exchange",
         "SZ": "Shenzhen Stock Exchange",
     }
+)
+
+
+# ISO 6166 shape: 2 letters, 9 alphanumeric characters, 1 check digit. ASCII only ([0-9],
+# not \d, which also takes other Unicode digits); always applied with fullmatch
+_ISIN_RE = re.compile(r"[A-Z]{2}[A-Z0-9]{9}[0-9]")
+
+# Fund-name noise stripped before searching Yahoo by name, removed in a single pass
+_NAME_NOISE_RE = re.compile(
+    r"\b(?:UCITS|ETF|Acc|Dist|Class|USD|EUR|GBP|HANetf|iShares|Vanguard|Amundi|Invesco"
+    r"|Xtrackers|SPDR)\b",
+    re.IGNORECASE,
+)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Search-result quote types an ISIN can belong to; indices, currencies, futures... can't
+_INSTRUMENT_QUOTE_TYPES: Final = frozenset({"EQUITY", "ETF", "MUTUALFUND"})
+
+# Lightweight quote endpoint: one record with the fields we need, instead of Ticker.info's
+# quoteSummary modules (financials, profile, statistics...)
+_QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+
+# (epoch second, ISO string) of the last formatted quote timestamp
+_last_timestamp: tuple[int, str] = (0, "")
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time in ISO format at second resolution, formatted once per second."""
+    global _last_timestamp
+    now = int(time.time())
+    cached = _last_timestamp
+    if cached[0] != now:
+        cached = (now, datetime.fromtimestamp(now, UTC).isoformat())
+        _last_timestamp = cached
+    return cached[1]
+
+
+# Lookups currently running in a worker thread, keyed by (operation, key)
+_inflight: dict[tuple[str, str], asyncio.Future] = {}
+
+
+async def coalesce(key: tuple[str, str], func, *args):
+    """
+    Run a blocking lookup in a worker thread, sharing it among concurrent callers.
+
+    Callers asking for the same key while a lookup is running await that lookup instead of
+    starting their own. Shielded so one cancelled caller doesn't cancel it for the others.
+    """
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(future)
+
+
+def _is_valid_price(price) -> bool:
+    """None, NaN and non-positive prices mean Yahoo has no usable data for a symbol."""
+    try:
+        # NaN compares False, so one comparison covers NaN, zero and negatives
+        return float(price) > 0
+    except (TypeError, ValueError):
+        return False
+
+
+def _is_upstream_failure(error: Exception) -> bool:
+    """
+    Whether an error means Yahoo itself is unreachable or struggling, as opposed to a bad symbol.
+
+    Connection errors, timeouts, rate limiting (429) and 5xx responses count; a 404 or an
+    empty payload for an unknown ticker does not.
+    """
+    if isinstance(
+        error,
+        YFRateLimitError
+        | curl_exceptions.ConnectionError
+        | curl_exceptions.Timeout
+        | ConnectionError
+        | TimeoutError,
+    ):
+        return True
+    if isinstance(error, curl_exceptions.HTTPError):
+        status = getattr(error.response, "status_code", None)
+        return status is not None and (status == 429 or status >= 500)
+    return False
+
+
+def is_valid_isin(isin: str) -> bool:
+    """
+    Validate ISIN code format and check digit (ISO 6166).
+    Standard: 2 letters, 9 alphanumeric characters, 1 check digit.
+
+    Rejecting a mistyped code here saves a Yahoo search round-trip that can't succeed.
+    """
+    if not isin:
+        return False
+    # Skip the upper() copy for the common, already-uppercase input
+    isin = isin if isin.isupper() else isin.upper()
+    if not _ISIN_RE.fullmatch(isin):
+        return False
+
+    # Luhn over the digit expansion, letters becoming 10-35 (A=10 ... Z=35)
+    digits = "".join(str(int(char, 36)) for char in isin)
+    total = 0
+    for position, digit in enumerate(reversed(digits)):
+        value = int(digit)
+        if position % 2:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return total % 10 == 0
+
+
+class YahooFinanceService:
+    """Service class to interact with Yahoo Finance via yfinance library."""
 
     # Common suffixes ordered by probability for European ETFs/stocks
-    FALLBACK_SUFFIXES = [
+    FALLBACK_SUFFIXES = (
         ".DE",  # Germany (XETRA, Frankfurt, Stuttgart)
         ".L",  # London
         ".PA",  # Paris
@@ -59,11 +173,66 @@ class YahooFinanceService:
         ".AX",  # Australia
         ".HK",  # Hong Kong
         ".T",  # Tokyo
-    ]
+    )
+
+    # Symbols per v7 quote request in batch mode
+    QUOTE_CHUNK_SIZE = 20
+
+    # Consecutive quote failures before Yahoo Finance calls are short-circuited
+    QUOTE_FAILURE_THRESHOLD = 5
+    QUOTE_COOLDOWN = timedelta(seconds=30)
+
+    def __init__(self):
+        settings = get_settings()
+        # Simple Circuit Breaker state for quote lookups
+        self.quote_failures = 0
+        self.quote_blocked_until = None
+        # In-memory memoization of successful lookups, shared by the executor threads
+        self._search_cache = TTLCache(
+            maxsize=settings.local_cache_maxsize, ttl=settings.search_cache_expire_seconds
+        )
+        # ISINs with no match are remembered for a shorter time so a re-listing is picked up
+        self._search_misses = TTLCache(
+            maxsize=settings.local_cache_maxsize, ttl=settings.search_miss_expire_seconds
+        )
+        self._quote_cache = TTLCache(
+            maxsize=settings.local_cache_maxsize, ttl=settings.quote_cache_expire_seconds
+        )
+        self._cache_lock = threading.Lock()
+
+    def search_by_isin(
+        self, isin: str, cached_info: TickerInfo | None = None
+    ) -> InstrumentResponse | None:
+        """
+        Search for an instrument by its ISIN code, serving repeated lookups from memory.
+
+        Args:
+            isin: The ISIN code to search for.
+            cached_info: Pre-fetched justETF metadata, used instead of querying the provider.
 
-    def search_by_isin(self, isin: str) -> InstrumentResponse | None:
+        Returns:
+            InstrumentResponse if found, None otherwise.
         """
-        Search for an instrument by its ISIN code.
+        with self._cache_lock:
+            if isin in self._search_misses:
+                return None
+            result = self._search_cache.get(isin)
+        if result is not None:
+            return result
+
+        # Confirmed misses are recorded by the lookup itself; a None from a failing
+        # upstream is not remembered, so the next request retries
+        result = self._search_by_isin(isin, cached_info)
+        if result is not None:
+            with self._cache_lock:
+                self._search_cache[isin] = result
+        return result
+
+    def _search_by_isin(
+        self, isin: str, cached_info: TickerInfo | None = None
+    ) -> InstrumentResponse | None:
+        """
+        Search Yahoo Finance (and fallbacks) for an instrument by its ISIN code.
 
         Uses a multi-level fallback strategy:
         1. Try the symbol returned by yfinance
@@ -72,13 +241,14 @@ class YahooFinanceService:
 
         Args:
             isin: The ISIN code to search for.
+            cached_info: Pre-fetched justETF metadata, used instead of querying the provider.
 
         Returns:
             InstrumentResponse if found, None otherwise.
         """
         # Validate ISIN format before anything else
         if not is_valid_isin(isin):
-            logger.warning(f"Invalid ISIN format received: {isin}")
+            logger.warning("Invalid ISIN format received: %s", isin)
             return None
 
         try:
@@ -86,20 +256,20 @@ class YahooFinanceService:
             search_result = yf.Search(isin)
 
             if not search_result.quotes:
-                logger.warning(f"No results found for ISIN: {isin}")
+                logger.info("No results found for ISIN: %s", isin)
                 # Try justETF as fallback for empty search results
-                return self._try_justetf_fallback(isin)
+                return self._try_justetf_fallback(isin, cached_info, remember_miss=True)
 
             # Get the first matching quote
             quote = search_result.quotes[0]
             original_symbol = quote.get("symbol", "")
 
             if not original_symbol:
-                logger.warning(f"No symbol found in search result for ISIN: {isin}")
-                return self._try_justetf_fallback(isin)
+                logger.info("No symbol found in search result for ISIN: %s", isin)
+                return self._try_justetf_fallback(isin, cached_info, remember_miss=True)
 
             # Step 2: Try to get valid ticker info
-            logger.warning(f"Searching ISIN {isin}: Probing primary symbol {original_symbol}")
+            logger.debug("Searching ISIN %s: Probing primary symbol %s", isin, original_symbol)
             result = self._try_get_instrument_info(isin, original_symbol, quote)
             if result:
                 return result
@@ -109,50 +279,86 @@ class YahooFinanceService:
             # OPTIMIZATION: If the base symbol is the ISIN itself, trying suffixes is usually futile
             # (ETFs use mnemonics like 'NATO', not 'IE000...'). Skip to save time.
             if base_symbol == isin:
-                logger.warning(
-                    f"Base ticker matches ISIN {isin}. Skipping suffix loop (unlikely to work)."
+                logger.debug(
+                    "Base ticker matches ISIN %s. Skipping suffix loop (unlikely to work).", isin
                 )
             else:
                 # Step 3: Try alternative suffixes
-                logger.warning(
-                    f"Primary symbol {original_symbol} has no price data for {isin}. "
-                    "Starting suffix fallback strategy..."
+                logger.debug(
+                    "Primary symbol %s has no price data for %s. Starting suffix fallback strategy...",
+                    original_symbol,
+                    isin,
                 )
 
-                for suffix in self.FALLBACK_SUFFIXES:
-                    candidate_symbol = f"{base_symbol}{suffix}"
-                    if candidate_symbol == original_symbol:
-                        continue
-
-                    logger.debug(f"Trying suffix {suffix} for {isin}: {candidate_symbol}")
-                    result = self._try_get_instrument_info(isin, candidate_symbol, quote)
-                    if result:
-                        logger.warning(
-                            f"SUCCESS: Found valid fallback symbol for {isin} -> {candidate_symbol}"
-                        )
-                        return result
+                result = self._probe_suffixes(isin, base_symbol, original_symbol, quote)
+                if result:
+                    logger.info("Found valid fallback symbol for %s -> %s", isin, result.symbol)
+                    return result
 
             # Step 3.5: Search by Name (New Strategy)
             # If we have a name from the initial ghost result, try searching for that name in Yahoo
             raw_name = quote.get("shortname") or quote.get("longname")
             if raw_name:
-                logger.warning(f"Attempting Search-By-Name fallback using: '{raw_name}'")
+                logger.debug("Attempting Search-By-Name fallback using: '%s'", raw_name)
                 result = self._try_search_by_name_fallback(isin, raw_name)
                 if result:
                     return result
 
             # Step 4: Try justETF as last resort
-            logger.warning(
-                f"All Yahoo attempts failed for {isin}. Attempting justETF scraping fallback..."
+            logger.debug(
+                "All Yahoo attempts failed for %s. Attempting justETF scraping fallback...", isin
             )
-            return self._try_justetf_fallback(isin)
+            return self._try_justetf_fallback(isin, cached_info)
 
         except Exception as e:
-            logger.error(f"Error searching for ISIN {isin}: {e}")
+            logger.error("Error searching for ISIN %s: %s", isin, e)
             raise
 
+    def _probe_suffixes(
+        self, isin: str, base_symbol: str, skip_symbol: str, quote: dict
+    ) -> InstrumentResponse | None:
+        """
+        Try base_symbol with each of FALLBACK_SUFFIXES, in priority order.
+
+        All candidates are quoted with a single v7 request and only the listings Yahoo
+        returns are checked; if that request fails, each candidate is probed in turn.
+
+        Args:
+            isin: Original ISIN code.
+            base_symbol: Ticker without exchange suffix.
+            skip_symbol: Symbol already tried by the caller.
+            quote: Search quote data used for the instrument name.
+
+        Returns:
+            InstrumentResponse for the first candidate with a valid price, None otherwise.
+        """
+        candidates = [
+            f"{base_symbol}{suffix}"
+            for suffix in self.FALLBACK_SUFFIXES
+            if f"{base_symbol}{suffix}" != skip_symbol
+        ]
+        try:
+            records = {
+                record.get("symbol"): record for record in self._fetch_quote_records(candidates)
+            }
+        except Exception as e:
+            logger.debug("Bulk suffix probe failed for %s: %s", isin, e)
+            records = None
+
+        for candidate in candidates:
+            if records is None:
+                logger.debug("Trying %s for %s", candidate, isin)
+                result = self._try_get_instrument_info(isin, candidate, quote)
+            elif candidate in records:
+                result = self._try_get_instrument_info(isin, candidate, quote, records[candidate])
+            else:
+                continue
+            if result:
+                return result
+        return None
+
     def _try_get_instrument_info(
-        self, isin: str, symbol: str, quote: dict
+        self, isin: str, symbol: str, quote: dict, info: dict | None = None
     ) -> InstrumentResponse | None:
         """
         Try to get instrument info for a symbol.
@@ -161,27 +367,28 @@ class YahooFinanceService:
             isin: Original ISIN code.
             symbol: Symbol to try.
             quote: Original search quote data.
+            info: Quote record already fetched for the symbol, if any.
 
         Returns:
             InstrumentResponse if valid data found, None otherwise.
         """
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            if info is None:
+                info = self._get_symbol_info(symbol)
 
             # Check if we have valid price data (indicates valid symbol)
             price = info.get("regularMarketPrice") or info.get("currentPrice")
 
             # Stricter check: None, NaN or 0.0 are considered invalid
-            if price is None or math.isnan(float(price)) or float(price) <= 0:
+            if not _is_valid_price(price):
                 return None
 
             # DETECT "GHOST" SYMBOLS:
             # If symbol contains the ISIN and lacks a longName, it's usually a dummy record in Yahoo.
             # Real symbols for these ETFs usually have a proper ticker (e.g. NATO.L)
-            symbol_base = symbol.split(".")[0]
+            symbol_base = symbol.partition(".")[0]
             if symbol_base == isin and not info.get("longName"):
-                logger.warning(f"Detected ghost symbol {symbol} for ISIN {isin}. Skipping...")
+                logger.debug("Detected ghost symbol %s for ISIN %s. Skipping...", symbol, isin)
                 return None
 
             # Determine instrument type
@@ -192,21 +399,85 @@ class YahooFinanceService:
             exchange = self._extract_exchange(symbol, info)
 
             # Get currency
-            currency = info.get("currency", "USD")
+            currency = info.get("currency") or "USD"
 
-            return InstrumentResponse(
+            # Every field is a str built here, so skip re-validating our own data
+            return InstrumentResponse.model_construct(
                 isin=isin,
                 symbol=symbol,
-                name=info.get("longName", info.get("shortName", quote.get("shortname", symbol))),
+                name=info.get("longName")
+                or info.get("shortName")
+                or quote.get("shortname")
+                or symbol,
                 type=instrument_type,
                 currency=currency,
                 exchange=exchange,
             )
 
         except Exception as e:
-            logger.debug(f"Failed to get info for symbol {symbol}: {e}")
+            logger.debug("Failed to get info for symbol %s: %s", symbol, e)
             return None
 
+    def _get_symbol_info(self, symbol: str) -> dict:
+        """
+        Get the quote record for a symbol via yfinance's shared session.
+
+        An empty result means Yahoo has no such symbol, so {} is returned. The full
+        Ticker.info is only fetched when the quote request itself fails.
+        """
+        try:
+            results = self._fetch_quote_records([symbol])
+        except Exception as e:
+            logger.debug("Quote endpoint failed for %s: %s", symbol, e)
+            return yf.Ticker(symbol).info
+        return results[0] if results else {}
+
+    def _fetch_quote_records(self, symbols: list[str]) -> list[dict]:
+        """Fetch v7 quote records for several symbols in a single request."""
+        response = yf.data.YfData().get(
+            _QUOTE_URL, params={"symbols": ",".join(symbols), "formatted": "false"}
+        )
+        response.raise_for_status()
+        # orjson parses the raw body several times faster than the stdlib json decoder
+        data = orjson.loads(response.content)
+        return (data["quoteResponse"]["result"] or []) if isinstance(data, dict) else []
+
+    def _fetch_quote_chunk(self, symbols: list[str]) -> dict[str, QuoteResponse]:
+        """
+        Quote a chunk of symbols with one v7 request, serving memoized quotes first.
+
+        Symbols without a valid price are left out, so callers can retry them through
+        get_quote and its self-correction logic.
+        """
+        found: dict[str, QuoteResponse] = {}
+        with self._cache_lock:
+            for symbol in symbols:
+                quote = self._quote_cache.get(symbol)
+                if quote is not None:
+                    found[symbol] = quote
+
+        missing = {symbol.upper(): symbol for symbol in symbols if symbol not in found}
+        if not missing or (
+            self.quote_blocked_until and datetime.now(UTC) < self.quote_blocked_until
+        ):
+            return found
+
+        for record in self._fetch_quote_records(list(missing.values())):
+            symbol = missing.get(str(record.get("symbol", "")).upper())
+            price = record.get("regularMarketPrice")
+            if symbol is None or not _is_valid_price(price):
+                continue
+            quote = QuoteResponse.model_construct(
+                symbol=symbol,
+                price=f"{float(price):.4f}",
+                currency=record.get("currency") or "USD",
+                time=_utc_timestamp(),
+            )
+            found[symbol] = quote
+            with self._cache_lock:
+                self._quote_cache[symbol] = quote
+        return found
+
     def _try_search_by_name_fallback(self, isin: str, name: str) -> InstrumentResponse | None:
         """
         Search for instrument by name when ISIN lookup yields invalid symbols.
@@ -223,34 +494,12 @@ class YahooFinanceService:
             # Remove: "UCITS", "ETF", "Acc", "Dist", issuer names like "HANetf", "iShares", etc.
             # Example: "HANetf Future of Defence UCITS ETF" -> "Future of Defence"
 
-            remove_terms = [
-                "UCITS",
-                "ETF",
-                "Acc",
-                "Dist",
-                "Class",
-                "USD",
-                "EUR",
-                "GBP",
-                "HANetf",
-                "iShares",
-                "Vanguard",
-                "Amundi",
-                "Invesco",
-                "Xtrackers",
-                "SPDR",
-            ]
-
-            search_query = name
-            for term in remove_terms:
-                search_query = search_query.replace(term, "")
-
-            search_query = search_query.strip()
+            search_query = _WHITESPACE_RE.sub(" ", _NAME_NOISE_RE.sub("", name)).strip()
             # If name becomes too short, revert to original (safety check)
             if len(search_query) < 4:
                 search_query = name
 
-            logger.debug(f"Searching Yahoo by name: {search_query} (Original: {name})")
+            logger.debug("Searching Yahoo by name: %s (Original: %s)", search_query, name)
             search_result = yf.Search(search_query)
 
             if not search_result.quotes:
@@ -266,30 +515,43 @@ class YahooFinanceService:
                 if isin in symbol:
                     continue
 
+                # Reject other asset classes from the search payload, without a quote request
+                quote_type = quote.get("quoteType")
+                if quote_type and quote_type not in _INSTRUMENT_QUOTE_TYPES:
+                    continue
+
                 result = self._try_get_instrument_info(isin, symbol, quote)
                 if result:
-                    logger.warning(f"Search-By-Name SUCCEEDED: Found {symbol} for '{name}'")
+                    logger.info("Search-By-Name succeeded: Found %s for '%s'", symbol, name)
                     return result
 
             return None
         except Exception as e:
-            logger.debug(f"Search-by-name failed: {e}")
+            logger.debug("Search-by-name failed: %s", e)
             return None
 
-    def _try_justetf_fallback(self, isin: str) -> InstrumentResponse | None:
+    def _try_justetf_fallback(
+        self, isin: str, cached_info: TickerInfo | None = None, remember_miss: bool = False
+    ) -> InstrumentResponse | None:
         """
         Try justETF as fallback source for European ETFs.
         If the suggested symbol doesn't work, attempts it with other suffixes.
 
         Args:
             isin: The ISIN code to search for.
+            cached_info: Pre-fetched justETF metadata, skips the provider lookup if given.
+            remember_miss: Whether a justETF answer without a ticker confirms the ISIN is
+                unknown (Yahoo's search came back empty too) and should be remembered.
 
         Returns:
             InstrumentResponse if found via justETF, None otherwise.
         """
         try:
-            ticker_info = justetf_provider.search_by_isin(isin)
+            ticker_info = cached_info or justetf_provider.search_by_isin(isin)
             if not ticker_info:
+                if remember_miss:
+                    with self._cache_lock:
+                        self._search_misses[isin] = True
                 return None
 
             # 1. Try the specific symbol JustETF suggested
@@ -299,38 +561,39 @@ class YahooFinanceService:
                 {"shortname": ticker_info.name},
             )
             if result:
-                logger.warning(f"justETF fallback SUCCEEDED for {isin} -> {ticker_info.symbol}")
+                logger.info("justETF fallback succeeded for %s -> %s", isin, ticker_info.symbol)
                 return result
 
             # 2. CROSS-POLLINATION: The suggested suffix failed, let's try the
             # suggested Ticker with OTHER Yahoo suffixes.
             # Example: JustETF says NATO.DE but Yahoo only likes NATO.L
-            base_ticker = ticker_info.symbol.split(".")[0]
-            logger.warning(
-                f"justETF suggested {ticker_info.symbol} for {isin} but it has no price. "
-                f"Trying ticker {base_ticker} with other suffixes..."
+            base_ticker = ticker_info.symbol.partition(".")[0]
+            logger.debug(
+                "justETF suggested %s for %s but it has no price. "
+                "Trying ticker %s with other suffixes...",
+                ticker_info.symbol,
+                isin,
+                base_ticker,
             )
 
-            for suffix in self.FALLBACK_SUFFIXES:
-                candidate = f"{base_ticker}{suffix}"
-                if candidate == ticker_info.symbol:
-                    continue
-
-                result = self._try_get_instrument_info(
-                    isin, candidate, {"shortname": ticker_info.name}
+            result = self._probe_suffixes(
+                isin, base_ticker, ticker_info.symbol, {"shortname": ticker_info.name}
+            )
+            if result:
+                logger.info(
+                    "Cross-referencing %s: justETF ticker %s -> %s",
+                    isin,
+                    base_ticker,
+                    result.symbol,
                 )
-                if result:
-                    logger.warning(
-                        f"SUCCESS: Cross-referencing {isin}: JustETF ticker {base_ticker} + suffix {suffix} -> {candidate}"
-                    )
-                    return result
+                return result
 
             # 3. Final fallback: Return info even without price if it's better than nothing
             # (only if we didn't find any working symbol)
             # IMPORTANT: We only return this if we are SURE it's better than nothing,
             # but we logs it clearly as it might not have quotes.
             logger.warning(
-                f"Could not find any working Yahoo symbol for ticker {base_ticker} on {isin}."
+                "Could not find any working Yahoo symbol for ticker %s on %s.", base_ticker, isin
             )
 
             # Final safety check: if we are here, we try one last name search
@@ -339,7 +602,7 @@ class YahooFinanceService:
             if result:
                 return result
 
-            return InstrumentResponse(
+            return InstrumentResponse.model_construct(
                 isin=isin,
                 symbol=ticker_info.symbol,
                 name=ticker_info.name,
@@ -349,12 +612,12 @@ class YahooFinanceService:
             )
 
         except Exception as e:
-            logger.debug(f"justETF fallback failed for {isin}: {e}")
+            logger.debug("justETF fallback failed for %s: %s", isin, e)
             return None
 
     def get_quote(self, symbol: str) -> QuoteResponse | None:
         """
-        Get current quote for a symbol.
+        Get current quote for a symbol, serving repeated lookups from memory.
 
         Args:
             symbol: The trading symbol (ticker).
@@ -362,6 +625,35 @@ class YahooFinanceService:
         Returns:
             QuoteResponse if found, None otherwise.
         """
+        with self._cache_lock:
+            result = self._quote_cache.get(symbol)
+        if result is not None:
+            return result
+
+        result = self._fetch_quote(symbol)
+        if result is not None:
+            with self._cache_lock:
+                self._quote_cache[symbol] = result
+        return result
+
+    def _fetch_quote(self, symbol: str, allow_repair: bool = True) -> QuoteResponse | None:
+        """
+        Fetch the current quote for a symbol from Yahoo Finance.
+
+        Args:
+            symbol: The trading symbol (ticker).
+            allow_repair: Whether an ISIN-like ghost symbol may be swapped for a better one.
+                The corrected symbol is fetched with repair disabled, so at most one retry.
+
+        Returns:
+            QuoteResponse if found, None otherwise.
+
+        Raises:
+            RuntimeError: if the circuit breaker is open after repeated upstream failures.
+        """
+        if self.quote_blocked_until and datetime.now(UTC) < self.quote_blocked_until:
+            raise RuntimeError("Yahoo Finance is temporarily unavailable")
+
         try:
             ticker = yf.Ticker(symbol)
 
@@ -369,47 +661,59 @@ class YahooFinanceService:
             try:
                 fast_info = ticker.fast_info
                 price = fast_info.get("lastPrice") or fast_info.get("regularMarketPrice")
-                currency = fast_info.get("currency", "USD")
+                currency = fast_info.get("currency") or "USD"
             except Exception:
                 info = ticker.info
                 price = info.get("regularMarketPrice") or info.get("currentPrice")
-                currency = info.get("currency", "USD")
+                currency = info.get("currency") or "USD"
 
-            if price is None or math.isnan(float(price)) or float(price) <= 0:
-                logger.warning(f"No valid price data found for symbol: {symbol} (Price: {price})")
+            if not _is_valid_price(price):
+                logger.warning(
+                    "No valid price data found for symbol: %s (Price: %s)", symbol, price
+                )
 
                 # SELF-CORRECTION LOGIC
                 # If symbol looks like an ISIN with a suffix (e.g., IE...SG),
                 # try to find the working symbol.
-                import re
-
-                base_part = symbol.split(".")[0] if "." in symbol else symbol
-                if re.match(r"^[A-Z]{2}[A-Z0-9]{9}\d$", base_part):
-                    logger.warning(
-                        f"Symbol {symbol} appears to be invalid or a ghost record. Attempting repair..."
+                base_part = symbol.partition(".")[0]
+                if allow_repair and _ISIN_RE.fullmatch(base_part):
+                    logger.info(
+                        "Symbol %s appears to be invalid or a ghost record. Attempting repair...",
+                        symbol,
                     )
                     better_instrument = self.search_by_isin(base_part)
                     if better_instrument and better_instrument.symbol != symbol:
-                        logger.warning(
-                            f"FOUND BETTER SYMBOL: {symbol} -> {better_instrument.symbol}"
+                        logger.info(
+                            "Found better symbol: %s -> %s", symbol, better_instrument.symbol
                         )
-                        # Recursive call with the corrected symbol
-                        return self.get_quote(better_instrument.symbol)
+                        # Single retry with the corrected symbol, no further repairs
+                        return self._fetch_quote(better_instrument.symbol, allow_repair=False)
 
                 return None
 
+            with self._cache_lock:
+                self.quote_failures = 0
+
             # Format price with 4 decimal places for consistency
-            price_str = f"{price:.4f}"
+            price_str = f"{float(price):.4f}"
 
-            return QuoteResponse(
+            return QuoteResponse.model_construct(
                 symbol=symbol,
                 price=price_str,
                 currency=currency,
-                time=datetime.now(UTC).isoformat(),
+                time=_utc_timestamp(),
             )
 
         except Exception as e:
-            logger.error(f"Error getting quote for symbol {symbol}: {e}")
+            logger.error("Error getting quote for symbol %s: %s", symbol, e)
+            # Only an unhealthy upstream trips the breaker; bad symbols must not lock out the rest
+            if _is_upstream_failure(e):
+                with self._cache_lock:
+                    self.quote_failures += 1
+                    if self.quote_failures >= self.QUOTE_FAILURE_THRESHOLD:
+                        logger.error("Yahoo Finance keeps failing. Tripping quote circuit breaker.")
+                        self.quote_blocked_until = datetime.now(UTC) + self.QUOTE_COOLDOWN
+                        self.quote_failures = 0
             raise
 
     def _extract_exchange(self, symbol: str, info: dict) -> str:
@@ -420,13 +724,29 @@ class YahooFinanceService:
             return exchange
 
         # Fall back to extracting from symbol suffix
-        if "." in symbol:
-            suffix = symbol.split(".")[-1]
-            return self.EXCHANGE_MAP.get(suffix, suffix)
+        _, sep, suffix = symbol.rpartition(".")
+        if sep:
+            return _EXCHANGE_MAP.get(suffix, suffix)
 
         # Default to US exchanges for symbols without suffix
         return "NYSE/NASDAQ"
 
+    @staticmethod
+    def _collect_outcomes(keys: list[str], outcomes: list) -> dict[str, tuple]:
+        """
+        Map gathered batch outcomes to (result, error) by key.
+
+        Tasks are gathered with return_exceptions=True so one failing lookup never cancels the
+        rest of the batch; an escaped exception becomes that key's error.
+        """
+        collected = {}
+        for key, outcome in zip(keys, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                collected[key] = (None, str(outcome))
+            else:
+                collected[key] = outcome[1:]
+        return collected
+
     async def batch_search_by_isins(
         self, isins: list[str]
     ) -> tuple[list[InstrumentResponse], list[tuple[str, str]]]:
@@ -443,24 +763,52 @@ class YahooFinanceService:
         results: list[InstrumentResponse] = []
         errors: list[tuple[str, str]] = []
 
-        # Execute all searches in parallel provided by asyncio.to_thread (uses global pool)
+        cache = fallback_providers.metadata_cache
+
+        # Look up each distinct ISIN once; duplicates are fanned back out below
+        unique_isins = list(dict.fromkeys(isins))
+
+        # Serve previously resolved ISINs from the response cache in a single round trip
+        outcomes: dict[str, tuple] = {
+            isin: (InstrumentResponse.model_validate_json(body), None)
+            for isin, body in (await cache.mget_responses(unique_isins)).items()
+        }
+        misses = [isin for isin in unique_isins if isin not in outcomes]
+
+        # Fetch cached justETF metadata for the remaining ISINs in a single Redis round trip
+        prefetched = await cache.mget(misses)
+
+        # Bound in-flight upstream calls so large batches don't trip Yahoo's rate limiting
+        semaphore = asyncio.Semaphore(get_settings().batch_concurrency)
+
+        # Execute all searches in parallel via asyncio.to_thread (the loop's default executor)
         async def search_single_wrapper(
             isin: str,
         ) -> tuple[str, InstrumentResponse | None, str | None]:
             try:
                 # Run the blocking search_by_isin in a separate thread
-                result = await asyncio.to_thread(self.search_by_isin, isin)
+                async with semaphore:
+                    result = await coalesce(
+                        ("search", isin), self.search_by_isin, isin, prefetched.get(isin)
+                    )
                 if result is None:
                     return (isin, None, "No instrument found for ISIN")
                 return (isin, result, None)
             except Exception as e:  # pragma: no cover
-                logger.error(f"Batch search error for ISIN {isin}: {e}")  # pragma: no cover
+                logger.error("Batch search error for ISIN %s: %s", isin, e)  # pragma: no cover
                 return (isin, None, str(e))  # pragma: no cover
 
-        tasks = [search_single_wrapper(isin) for isin in isins]
-        search_results = await asyncio.gather(*tasks)
-
-        for isin, result, error in search_results:
+        tasks = [search_single_wrapper(isin) for isin in misses]
+        fetched = self._collect_outcomes(
+            misses, await asyncio.gather(*tasks, return_exceptions=True)
+        )
+        await cache.set_responses(
+            {isin: result for isin, (result, _) in fetched.items() if result is not None}
+        )
+        outcomes.update(fetched)
+
+        for isin in isins:
+            result, error = outcomes[isin]
             if result is not None:
                 results.append(result)
             elif error is not None:
@@ -483,22 +831,62 @@ class YahooFinanceService:
         results: list[QuoteResponse] = []
         errors: list[tuple[str, str]] = []
 
-        # Execute all quote requests in parallel
+        semaphore = asyncio.Semaphore(get_settings().batch_concurrency)
+
+        # Execute all quote requests in parallel, bounded by the semaphore
         async def get_quote_wrapper(symbol: str) -> tuple[str, QuoteResponse | None, str | None]:
             try:
                 # Run the blocking get_quote in a separate thread
-                result = await asyncio.to_thread(self.get_quote, symbol)
+                async with semaphore:
+                    result = await coalesce(("quote", symbol), self.get_quote, symbol)
                 if result is None:
                     return (symbol, None, "No quote data available")
                 return (symbol, result, None)
             except Exception as e:  # pragma: no cover
-                logger.error(f"Batch quote error for symbol {symbol}: {e}")  # pragma: no cover
+                logger.error("Batch quote error for symbol %s: %s", symbol, e)  # pragma: no cover
                 return (symbol, None, str(e))  # pragma: no cover
 
-        tasks = [get_quote_wrapper(symbol) for symbol in symbols]
-        quote_results = await asyncio.gather(*tasks)
-
-        for symbol, result, error in quote_results:
+        async def get_chunk_wrapper(chunk: list[str]) -> dict[str, QuoteResponse]:
+            try:
+                async with semaphore:
+                    return await asyncio.to_thread(self._fetch_quote_chunk, chunk) or {}
+            except Exception as e:
+                logger.debug("Bulk quote request failed, falling back per symbol: %s", e)
+                return {}
+
+        cache = fallback_providers.quote_cache
+
+        # Fetch each distinct symbol once; duplicates are fanned back out in input order
+        unique_symbols = list(dict.fromkeys(symbols))
+
+        # Serve still-fresh quotes from the cache in a single round trip
+        cached = {
+            symbol: QuoteResponse.model_validate_json(body)
+            for symbol, body in (await cache.mget(unique_symbols)).items()
+        }
+        misses = [symbol for symbol in unique_symbols if symbol not in cached]
+
+        # Resolve most symbols with one v7 quote request per chunk
+        size = self.QUOTE_CHUNK_SIZE
+        chunks = [misses[i : i + size] for i in range(0, len(misses), size)]
+        prefetched: dict[str, QuoteResponse] = {}
+        for found in await asyncio.gather(*(get_chunk_wrapper(chunk) for chunk in chunks)):
+            prefetched.update(found)
+
+        # Whatever the bulk request missed goes through get_quote (fast_info, self-correction)
+        remaining = [symbol for symbol in misses if symbol not in prefetched]
+        tasks = [get_quote_wrapper(symbol) for symbol in remaining]
+        outcomes = self._collect_outcomes(
+            remaining, await asyncio.gather(*tasks, return_exceptions=True)
+        )
+        outcomes.update((symbol, (quote, None)) for symbol, quote in prefetched.items())
+        await cache.set_many(
+            {symbol: quote for symbol, (quote, _) in outcomes.items() if quote is not None}
+        )
+        outcomes.update((symbol, (quote, None)) for symbol, quote in cached.items())
+
+        for symbol in symbols:
+            result, error = outcomes[symbol]
             if result is not None:
                 results.append(result)
             elif error is not None:
@@ -1,8 +1,143 @@
-from unittest.mock import MagicMock
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock, create_autospec
 
+import httpx
 import pytest
+from fastapi.testclient import TestClient
 
+import src.routes.quote
+import src.routes.search
 import src.services.fallback_providers
+from src.main import app
+from src.models.schemas import InstrumentResponse, QuoteResponse
+from src.services.fallback_providers import JustETFProvider, MetadataCache, QuoteCache
+from src.services.yahoo_finance import YahooFinanceService, yahoo_finance_service
+
+# Real ISINs from the user's portfolio, shared by the live and container suites
+PORTFOLIO_ISINS = (
+    "CNE100000296",  # BYD
+    "GB00B63H8491",  # Rolls-Royce
+    "IE000OJ5TQP4",  # Future of Defence (Tricky one!)
+    "IE00BK5BQT80",  # VWRA
+    "IE00BM67HT60",  # Xtrackers MSCI World IT
+    "IE00BMW42306",  # iShares MSCI Europe SRI
+    "KYG875721634",  # Tencent
+    "KYG9830T1067",  # Xiaomi
+    "NL0009538784",  # NXP
+    "US0090661010",  # Airbnb
+    "US8740391003",  # Taiwan Semi (US ADR)
+)
+
+# DOCKER_HOST_TESTS=0 keeps the Docker test module (and testcontainers) out of collection
+if os.getenv("DOCKER_HOST_TESTS", "1") == "0":
+    collect_ignore = ["test_container_integration.py"]
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient for the whole session, so the app lifespan runs once."""
+    with TestClient(app) as test_client:
+        # Build the OpenAPI schema up front instead of inside whichever test hits it first
+        app.openapi()
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def aapl_instrument():
+    """Search result shared by the endpoint tests; built (and validated) once."""
+    return InstrumentResponse(
+        isin="US0378331005",
+        symbol="AAPL",
+        name="Apple Inc.",
+        type="stock",
+        currency="USD",
+        exchange="NASDAQ",
+    )
+
+
+@pytest.fixture(scope="session")
+def aapl_quote():
+    """Quote shared by the endpoint tests; built (and validated) once."""
+    return QuoteResponse(
+        symbol="AAPL",
+        price="195.5000",
+        currency="USD",
+        time="2024-12-24T15:00:00+00:00",
+    )
+
+
+@pytest.fixture(scope="session")
+async def aclient():
+    """Async client calling the app in-process, for tests of async routes (no portal thread)."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+        yield async_client
+
+
+class _RaisingFastInfo(dict):
+    """fast_info whose lookups fail, like a ticker Yahoo has no fast data for."""
+
+    def __init__(self, error: Exception):
+        super().__init__()
+        self.error = error
+
+    def get(self, *args, **kwargs):
+        raise self.error
+
+
+def _make_ticker(fast_info=None, info=None):
+    """A yf.Ticker stand-in; an Exception as fast_info makes every fast_info lookup raise it."""
+    if fast_info is None:
+        fast_info = {}
+    elif isinstance(fast_info, Exception):
+        fast_info = _RaisingFastInfo(fast_info)
+    # The service only reads fast_info and info, so no MagicMock is needed
+    return SimpleNamespace(fast_info=fast_info, info=info or {})
+
+
+@pytest.fixture
+def mock_yf(monkeypatch):
+    """Replace the yfinance module the service uses with a MagicMock for this test."""
+    mock = MagicMock()
+    monkeypatch.setattr("src.services.yahoo_finance.yf", mock)
+    return mock
+
+
+@pytest.fixture
+def mock_search_service(monkeypatch):
+    """Replace the service the search routes call with a MagicMock for this test."""
+    mock = MagicMock()
+    monkeypatch.setattr("src.routes.search.yahoo_finance_service", mock)
+    return mock
+
+
+@pytest.fixture
+def mock_quote_service(monkeypatch):
+    """Replace the service the quote routes call with a MagicMock for this test."""
+    mock = MagicMock()
+    monkeypatch.setattr("src.routes.quote.yahoo_finance_service", mock)
+    return mock
+
+
+@pytest.fixture
+def mock_justetf(monkeypatch):
+    """Replace the justETF provider the service uses with an autospec'd mock for this test."""
+    mock = create_autospec(JustETFProvider, instance=True)
+    monkeypatch.setattr("src.services.yahoo_finance.justetf_provider", mock)
+    return mock
+
+
+@pytest.fixture
+def make_ticker():
+    """Factory for yf.Ticker stand-ins with the given fast_info and info data."""
+    return _make_ticker
+
+
+@pytest.fixture
+def yf_service():
+    """A fresh YahooFinanceService, so memoized lookups and breaker state never leak."""
+    return YahooFinanceService()
 
 
 @pytest.fixture(autouse=True)
@@ -13,15 +148,53 @@ def mock_metadata_cache(request):
         yield None
         return
 
-    mock = MagicMock()
+    # Autospec keeps the async methods awaitable
+    mock = create_autospec(MetadataCache, instance=True)
     mock.enabled = False
     mock.get.return_value = None
+    mock.mget.return_value = {}
+    mock.get_response.return_value = None
+    mock.mget_responses.return_value = {}
 
-    # Store original
+    # Store original (the search route binds the cache by name too)
     original = src.services.fallback_providers.metadata_cache
     src.services.fallback_providers.metadata_cache = mock
+    src.routes.search.metadata_cache = mock
 
     yield mock
 
     # Restore
     src.services.fallback_providers.metadata_cache = original
+    src.routes.search.metadata_cache = original
+
+
+@pytest.fixture(autouse=True)
+def mock_quote_cache(request):
+    """Automatically mock the quote cache for the quote route and the batch service."""
+    if "container" in request.keywords:
+        yield None
+        return
+
+    mock = create_autospec(QuoteCache, instance=True)
+    mock.enabled = False
+    mock.get.return_value = None
+    mock.get_stale.return_value = None
+    mock.mget.return_value = {}
+
+    original = src.services.fallback_providers.quote_cache
+    src.services.fallback_providers.quote_cache = mock
+    src.routes.quote.quote_cache = mock
+
+    yield mock
+
+    src.services.fallback_providers.quote_cache = original
+    src.routes.quote.quote_cache = original
+
+
+@pytest.fixture(autouse=True)
+def clear_service_memo():
+    """Keep memoized lookups on the shared service from leaking between tests."""
+    yield
+    yahoo_finance_service._search_cache.clear()
+    yahoo_finance_service._search_misses.clear()
+    yahoo_finance_service._quote_cache.clear()
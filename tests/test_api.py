@@ -1,165 +1,249 @@
 """Comprehensive tests for the Market Data Service API with 100% coverage."""
 
-from unittest.mock import MagicMock, patch
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import orjson
 import pytest
+from curl_cffi.requests import exceptions as curl_exceptions
 from fastapi.testclient import TestClient
 
-from src.main import app
-from src.models.schemas import InstrumentResponse, QuoteResponse
+from src.models.schemas import (
+    BatchQuoteRequest,
+    BatchQuoteResponse,
+    BatchSearchRequest,
+    BatchSearchResponse,
+    ErrorResponse,
+    HealthResponse,
+    InstrumentResponse,
+    QuoteErrorItem,
+    QuoteResponse,
+    SearchErrorItem,
+)
+from src.responses import ORJSONResponse
+from src.services.fallback_providers import (
+    ProviderUnavailableError,
+    TickerInfo,
+    justetf_provider,
+)
 
-client = TestClient(app)
+
+def assert_json(response, status: int) -> dict:
+    """Assert the response status and return its JSON body, parsed once with orjson."""
+    assert response.status_code == status, response.text
+    return orjson.loads(response.content)
+
+
+# Ticker.info of a priced equity; tests override only the fields they care about
+_EQUITY_INFO = {
+    "quoteType": "EQUITY",
+    "longName": "Apple Inc.",
+    "currency": "USD",
+    "exchange": "NASDAQ",
+    "regularMarketPrice": 195.50,
+}
+
+
+def equity_info(**overrides) -> dict:
+    """Return a Ticker.info dict built from the priced-equity template."""
+    return {**_EQUITY_INFO, **overrides}
+
+
+def html_response(text: str = "") -> SimpleNamespace:
+    """Return a successful justETF page response stub."""
+    return SimpleNamespace(status_code=200, text=text, raise_for_status=lambda: None)
 
 
 class TestHealthEndpoint:
     """Tests for the health check endpoint."""
 
-    def test_health_check_returns_healthy(self):
+    def test_health_check_returns_healthy(self, client):
         """Test that health check returns healthy status."""
         response = client.get("/health")
 
-        assert response.status_code == 200
-        data = response.json()
+        data = assert_json(response, 200)
         assert data["status"] == "healthy"
         assert "version" in data
 
-    def test_root_endpoint_returns_api_info(self):
+    def test_root_endpoint_returns_api_info(self, client):
         """Test that root endpoint returns API information."""
         response = client.get("/")
 
-        assert response.status_code == 200
-        data = response.json()
+        data = assert_json(response, 200)
         assert "name" in data
         assert "version" in data
         assert "docs" in data
         assert data["docs"] == "/docs"
 
+    def test_openapi_documents_response_models(self, client):
+        """Test that routes without response validation still document their schemas."""
+        response = client.get("/openapi.json")
+
+        spec = assert_json(response, 200)
+        schemas = spec["components"]["schemas"]
+        assert "QuoteResponse" in schemas
+        assert "InstrumentResponse" in schemas
+        assert "BatchQuoteResponse" in schemas
+        assert "BatchSearchResponse" in schemas
+        assert "/health" not in spec["paths"]
+
 
 class TestSearchEndpoint:
     """Tests for the search endpoint."""
 
-    @patch("src.routes.search.yahoo_finance_service")
-    def test_search_by_isin_success(self, mock_service):
+    def test_search_by_isin_success(self, mock_search_service, client, aapl_instrument):
         """Test successful ISIN search."""
-        mock_service.search_by_isin.return_value = InstrumentResponse(
-            isin="US0378331005",
-            symbol="AAPL",
-            name="Apple Inc.",
-            type="stock",
-            currency="USD",
-            exchange="NASDAQ",
-        )
+        mock_search_service.search_by_isin.return_value = aapl_instrument
 
         response = client.get("/api/v1/search/US0378331005")
 
-        assert response.status_code == 200
-        data = response.json()
+        data = assert_json(response, 200)
         assert data["isin"] == "US0378331005"
         assert data["symbol"] == "AAPL"
         assert data["name"] == "Apple Inc."
         assert data["type"] == "stock"
         assert data["currency"] == "USD"
-        mock_service.search_by_isin.assert_called_once_with("US0378331005")
-
-    @patch("src.routes.search.yahoo_finance_service")
-    def test_search_by_isin_not_found(self, mock_service):
-        """Test ISIN search when instrument not found."""
-        mock_service.search_by_isin.return_value = None
+        mock_search_service.search_by_isin.assert_called_once_with("US0378331005")
+
+    def test_search_by_isin_served_from_cache(
+        self, mock_search_service, mock_metadata_cache, client
+    ):
+        """Test cached search responses are sent without calling the service."""
+        mock_metadata_cache.get_response.return_value = (
+            '{"isin":"US0378331005","symbol":"AAPL","name":"Apple Inc.",'
+            '"type":"stock","currency":"USD","exchange":"NASDAQ"}'
+        )
 
-        response = client.get("/api/v1/search/US1234567891")
+        response = client.get("/api/v1/search/US0378331005")
 
-        assert response.status_code == 404
-        data = response.json()
-        assert "detail" in data
-        assert "US1234567891" in data["detail"]
+        assert response.status_code == 200
+        assert response.json()["symbol"] == "AAPL"
+        mock_search_service.search_by_isin.assert_not_called()
+        mock_metadata_cache.set_response.assert_not_called()
 
-    @patch("src.routes.search.yahoo_finance_service")
-    def test_search_by_isin_service_error(self, mock_service):
-        """Test ISIN search when service throws an exception."""
-        mock_service.search_by_isin.side_effect = Exception("API Error")
+    def test_search_by_isin_populates_cache(
+        self, mock_search_service, mock_metadata_cache, client, aapl_instrument
+    ):
+        """Test fresh search results are cached as rendered responses."""
+        mock_search_service.search_by_isin.return_value = aapl_instrument
 
         response = client.get("/api/v1/search/US0378331005")
 
-        assert response.status_code == 500
-        data = response.json()
+        assert response.status_code == 200
+        mock_metadata_cache.set_response.assert_called_once_with("US0378331005", aapl_instrument)
+
+    def test_search_by_isin_not_found(self, mock_search_service, client):
+        """Test ISIN search when instrument not found."""
+        mock_search_service.search_by_isin.return_value = None
+
+        response = client.get("/api/v1/search/US1234567891")
+
+        data = assert_json(response, 404)
         assert "detail" in data
-        assert "API Error" in data["detail"]
+        assert "US1234567891" in data["detail"]
 
 
 class TestQuoteEndpoint:
     """Tests for the quote endpoint."""
 
-    @patch("src.routes.quote.yahoo_finance_service")
-    def test_get_quote_success(self, mock_service):
+    def test_get_quote_success(self, mock_quote_service, client, aapl_quote):
         """Test successful quote retrieval."""
-        mock_service.get_quote.return_value = QuoteResponse(
-            symbol="AAPL",
-            price="195.5000",
-            currency="USD",
-            time="2024-12-24T15:00:00+00:00",
-        )
+        mock_quote_service.get_quote.return_value = aapl_quote
 
         response = client.get("/api/v1/quote/AAPL")
 
-        assert response.status_code == 200
-        data = response.json()
+        data = assert_json(response, 200)
         assert data["symbol"] == "AAPL"
         assert data["price"] == "195.5000"
         assert data["currency"] == "USD"
-        mock_service.get_quote.assert_called_once_with("AAPL")
+        mock_quote_service.get_quote.assert_called_once_with("AAPL")
+
+    def test_get_quote_served_from_cache(
+        self, mock_quote_service, mock_quote_cache, client, aapl_quote
+    ):
+        """Test cached quotes are returned without calling the service."""
+        mock_quote_cache.get.return_value = aapl_quote.model_dump_json()
+
+        response = client.get("/api/v1/quote/AAPL")
 
-    @patch("src.routes.quote.yahoo_finance_service")
-    def test_get_quote_not_found(self, mock_service):
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json()["price"] == "195.5000"
+        mock_quote_service.get_quote.assert_not_called()
+        mock_quote_cache.set.assert_not_called()
+
+    def test_get_quote_populates_cache(
+        self, mock_quote_service, mock_quote_cache, client, aapl_quote
+    ):
+        """Test fresh quotes are written to the cache."""
+        mock_quote_cache.get.return_value = None
+        mock_quote_service.get_quote.return_value = aapl_quote
+
+        response = client.get("/api/v1/quote/AAPL")
+
+        assert response.status_code == 200
+        mock_quote_cache.set.assert_called_once_with("AAPL", aapl_quote)
+
+    def test_get_quote_not_found(self, mock_quote_service, client):
         """Test quote when symbol not found."""
-        mock_service.get_quote.return_value = None
+        mock_quote_service.get_quote.return_value = None
 
         response = client.get("/api/v1/quote/INVALID")
 
-        assert response.status_code == 404
-        data = response.json()
+        data = assert_json(response, 404)
         assert "detail" in data
         assert "INVALID" in data["detail"]
 
-    @patch("src.routes.quote.yahoo_finance_service")
-    def test_get_quote_service_error(self, mock_service):
-        """Test quote when service throws an exception."""
-        mock_service.get_quote.side_effect = Exception("Network Error")
+    def test_get_quote_runs_on_shared_executor(self, mock_quote_service, client, aapl_quote):
+        """Test the app lifespan routes to_thread calls through the shared executor."""
+        threads = []
+
+        def fake_get_quote(symbol):
+            threads.append(threading.current_thread().name)
+            return aapl_quote
+
+        mock_quote_service.get_quote.side_effect = fake_get_quote
 
         response = client.get("/api/v1/quote/AAPL")
 
-        assert response.status_code == 500
-        data = response.json()
-        assert "detail" in data
-        assert "Network Error" in data["detail"]
+        assert response.status_code == 200
+        assert threads[0].startswith("yf")
+
+    def test_get_quote_serves_stale_on_service_error(
+        self, mock_quote_service, mock_quote_cache, client, aapl_quote
+    ):
+        """Test the last known quote is served when the service fails."""
+        mock_quote_service.get_quote.side_effect = Exception("Network Error")
+        mock_quote_cache.get_stale.return_value = aapl_quote.model_dump_json()
+
+        response = client.get("/api/v1/quote/AAPL")
+
+        assert response.status_code == 200
+        assert response.headers["X-Cache"] == "STALE"
+        assert response.json()["price"] == "195.5000"
 
 
 class TestYahooFinanceServiceSearch:
     """Tests for the Yahoo Finance service search_by_isin method."""
 
-    @patch("src.services.yahoo_finance.justetf_provider")
-    @patch("src.services.yahoo_finance.yf")
-    def test_search_by_isin_success(self, mock_yf, mock_justetf):
-        """Test successful ISIN search with mocked yfinance."""
-        from src.services.yahoo_finance import YahooFinanceService
+    @pytest.fixture(autouse=True)
+    def _null_justetf(self, mock_justetf):
+        """Keep the justETF fallback offline and empty unless a test configures it."""
+        mock_justetf.search_by_isin.return_value = None
 
+    def test_search_by_isin_success(self, mock_yf, yf_service, make_ticker):
+        """Test successful ISIN search with mocked yfinance."""
         # Mock Search result
-        mock_search = MagicMock()
-        mock_search.quotes = [{"symbol": "AAPL", "shortname": "Apple Inc"}]
-        mock_yf.Search.return_value = mock_search
+        mock_yf.Search.return_value = SimpleNamespace(
+            quotes=[{"symbol": "AAPL", "shortname": "Apple Inc"}]
+        )
 
         # Mock Ticker info with price (required for valid result)
-        mock_ticker = MagicMock()
-        mock_ticker.info = {
-            "quoteType": "EQUITY",
-            "longName": "Apple Inc.",
-            "currency": "USD",
-            "exchange": "NASDAQ",
-            "regularMarketPrice": 195.50,
-        }
-        mock_yf.Ticker.return_value = mock_ticker
-
-        service = YahooFinanceService()
-        result = service.search_by_isin("US0378331005")
+        mock_yf.Ticker.return_value = make_ticker(info=equity_info())
+
+        result = yf_service.search_by_isin("US0378331005")
 
         assert result is not None
         assert result.isin == "US0378331005"
@@ -169,205 +253,144 @@ class TestYahooFinanceServiceSearch:
         assert result.currency == "USD"
         assert result.exchange == "NASDAQ"
 
-    @patch("src.services.yahoo_finance.justetf_provider")
-    @patch("src.services.yahoo_finance.yf")
-    def test_search_by_isin_etf_type(self, mock_yf, mock_justetf):
-        """Test ISIN search for ETF type."""
-        from src.services.yahoo_finance import YahooFinanceService
-
-        mock_search = MagicMock()
-        mock_search.quotes = [{"symbol": "VOO"}]
-        mock_yf.Search.return_value = mock_search
-
-        mock_ticker = MagicMock()
-        mock_ticker.info = {
-            "quoteType": "ETF",
-            "longName": "Vanguard S&P 500 ETF",
-            "currency": "USD",
-            "exchange": "NYSE ARCA",
-            "regularMarketPrice": 450.00,
-        }
-        mock_yf.Ticker.return_value = mock_ticker
-
-        service = YahooFinanceService()
-        result = service.search_by_isin("US9229087690")
-
-        assert result is not None
-        assert result.type == "etf"
+        # Repeated lookups are served from memory
+        assert yf_service.search_by_isin("US0378331005") is result
+        mock_yf.Search.assert_called_once_with("US0378331005")
 
-    @patch("src.services.yahoo_finance.justetf_provider")
-    @patch("src.services.yahoo_finance.yf")
-    def test_search_by_isin_no_results(self, mock_yf, mock_justetf):
-        """Test ISIN search with no results falls back to justETF."""
-        from src.services.yahoo_finance import YahooFinanceService
+    def test_get_symbol_info_prefers_quote_endpoint(self, mock_yf, yf_service):
+        """Test the v7 quote record is used instead of the heavier Ticker.info."""
+        record = {"symbol": "AAPL", "longName": "Apple Inc.", "regularMarketPrice": 195.5}
+        mock_get = mock_yf.data.YfData.return_value.get
+        mock_get.return_value.content = orjson.dumps({"quoteResponse": {"result": [record]}})
 
-        mock_search = MagicMock()
-        mock_search.quotes = []
-        mock_yf.Search.return_value = mock_search
+        assert yf_service._get_symbol_info("AAPL") == record
+        mock_yf.Ticker.assert_not_called()
 
-        # justETF also returns None
-        mock_justetf.search_by_isin.return_value = None
+        # An empty result is authoritative: no such symbol, and no Ticker.info request
+        mock_get.return_value.content = orjson.dumps({"quoteResponse": {"result": []}})
+        assert yf_service._get_symbol_info("NOPE") == {}
+        mock_yf.Ticker.assert_not_called()
 
-        service = YahooFinanceService()
-        result = service.search_by_isin("US1234567891")
+        # Only a failing quote request falls back to Ticker.info
+        mock_yf.Ticker.return_value.info = {"longName": "Apple Inc."}
+        mock_get.return_value.raise_for_status.side_effect = Exception("401")
+        assert yf_service._get_symbol_info("AAPL") == {"longName": "Apple Inc."}
 
-        assert result is None
-        mock_justetf.search_by_isin.assert_called_once_with("US1234567891")
-
-    @patch("src.services.yahoo_finance.justetf_provider")
-    @patch("src.services.yahoo_finance.yf")
-    def test_search_by_isin_no_symbol_in_quote(self, mock_yf, mock_justetf):
-        """Test ISIN search when quote has no symbol falls back to justETF."""
-        from src.services.yahoo_finance import YahooFinanceService
-
-        mock_search = MagicMock()
-        mock_search.quotes = [{"shortname": "Test"}]  # No symbol
-        mock_yf.Search.return_value = mock_search
-
-        mock_justetf.search_by_isin.return_value = None
+    def test_search_by_isin_no_results(self, mock_justetf, mock_yf, yf_service):
+        """Test ISIN search with no results falls back to justETF."""
+        mock_yf.Search.return_value = SimpleNamespace(quotes=[])
 
-        service = YahooFinanceService()
-        result = service.search_by_isin("US0378331005")
+        result = yf_service.search_by_isin("US1234567899")
 
         assert result is None
+        mock_justetf.search_by_isin.assert_called_once_with("US1234567899")
 
-    @patch("src.services.yahoo_finance.justetf_provider")
-    @patch("src.services.yahoo_finance.yf")
-    def test_search_by_isin_uses_shortname_fallback(self, mock_yf, mock_justetf):
-        """Test ISIN search uses shortName as fallback for name."""
-        from src.services.yahoo_finance import YahooFinanceService
-
-        mock_search = MagicMock()
-        mock_search.quotes = [{"symbol": "TEST", "shortname": "Test Company"}]
-        mock_yf.Search.return_value = mock_search
-
-        mock_ticker = MagicMock()
-        mock_ticker.info = {
-            "quoteType": "EQUITY",
-            "shortName": "Test Co",  # No longName
-            "currency": "EUR",
-            "exchange": "",
-            "regularMarketPrice": 100.00,
-        }
-        mock_yf.Ticker.return_value = mock_ticker
-
-        service = YahooFinanceService()
-        result = service.search_by_isin("US1234567895")
+        # The miss is remembered, so Yahoo is not queried again
+        assert yf_service.search_by_isin("US1234567899") is None
+        mock_yf.Search.assert_called_once_with("US1234567899")
 
-        assert result is not None
-        assert result.name == "Test Co"
-
-    @patch("src.services.yahoo_finance.justetf_provider")
-    @patch("src.services.yahoo_finance.yf")
-    def test_search_by_isin_uses_quote_shortname_fallback(self, mock_yf, mock_justetf):
-        """Test ISIN search uses quote shortname when info has no name."""
-        from src.services.yahoo_finance import YahooFinanceService
-
-        mock_search = MagicMock()
-        mock_search.quotes = [{"symbol": "TEST", "shortname": "Fallback Name"}]
-        mock_yf.Search.return_value = mock_search
-
-        mock_ticker = MagicMock()
-        mock_ticker.info = {
-            "quoteType": "EQUITY",
-            "currency": "GBP",
-            "regularMarketPrice": 50.00,
-        }
-        mock_yf.Ticker.return_value = mock_ticker
-
-        service = YahooFinanceService()
-        result = service.search_by_isin("US1234567895")
-
-        assert result is not None
-        assert result.name == "Fallback Name"
+    def test_search_by_isin_unavailable_justetf_not_remembered(
+        self, mock_justetf, mock_yf, yf_service
+    ):
+        """Test a blocked or failing justETF is retried rather than cached as a miss."""
+        mock_yf.Search.return_value = SimpleNamespace(quotes=[])
+        mock_justetf.search_by_isin.side_effect = ProviderUnavailableError("blocked")
 
-    @patch("src.services.yahoo_finance.justetf_provider")
-    @patch("src.services.yahoo_finance.yf")
-    def test_search_by_isin_symbol_fallback_for_name(self, mock_yf, mock_justetf):
-        """Test ISIN search uses symbol when no name available."""
-        from src.services.yahoo_finance import YahooFinanceService
+        assert yf_service.search_by_isin("US1234567899") is None
+        assert yf_service.search_by_isin("US1234567899") is None
 
-        mock_search = MagicMock()
-        mock_search.quotes = [{"symbol": "NONAME"}]
-        mock_yf.Search.return_value = mock_search
+        assert mock_yf.Search.call_count == 2
+        assert mock_justetf.search_by_isin.call_count == 2
 
-        mock_ticker = MagicMock()
-        mock_ticker.info = {
-            "quoteType": "EQUITY",
-            "currency": "USD",
-            "regularMarketPrice": 25.00,
-        }
-        mock_yf.Ticker.return_value = mock_ticker
-
-        service = YahooFinanceService()
-        result = service.search_by_isin("US1234567895")
+    def test_search_by_isin_no_symbol_in_quote(self, mock_justetf, mock_yf, yf_service):
+        """Test ISIN search when quote has no symbol falls back to justETF."""
+        mock_yf.Search.return_value = SimpleNamespace(quotes=[{"shortname": "Test"}])  # No symbol
 
-        assert result is not None
-        assert result.name == "NONAME"
-
-    @patch("src.services.yahoo_finance.justetf_provider")
-    @patch("src.services.yahoo_finance.yf")
-    def test_search_by_isin_extract_exchange_from_symbol(self, mock_yf, mock_justetf):
-        """Test ISIN search extracts exchange from symbol suffix."""
-        from src.services.yahoo_finance import YahooFinanceService
-
-        mock_search = MagicMock()
-        mock_search.quotes = [{"symbol": "RR.L"}]
-        mock_yf.Search.return_value = mock_search
-
-        mock_ticker = MagicMock()
-        mock_ticker.info = {
-            "quoteType": "EQUITY",
-            "longName": "Rolls-Royce",
-            "currency": "GBP",
-            "exchange": "",  # Empty exchange
-            "regularMarketPrice": 5.50,
-        }
-        mock_yf.Ticker.return_value = mock_ticker
-
-        service = YahooFinanceService()
-        result = service.search_by_isin("GB00B63H8491")
+        result = yf_service.search_by_isin("US0378331005")
 
-        assert result is not None
-        assert result.exchange == "London Stock Exchange"
+        assert result is None
 
-    @patch("src.services.yahoo_finance.justetf_provider")
-    @patch("src.services.yahoo_finance.yf")
-    def test_search_by_isin_default_exchange_for_us_stock(self, mock_yf, mock_justetf):
-        """Test ISIN search defaults to NYSE/NASDAQ for US stocks."""
-        from src.services.yahoo_finance import YahooFinanceService
-
-        mock_search = MagicMock()
-        mock_search.quotes = [{"symbol": "AAPL"}]  # No suffix
-        mock_yf.Search.return_value = mock_search
-
-        mock_ticker = MagicMock()
-        mock_ticker.info = {
-            "quoteType": "EQUITY",
-            "longName": "Apple",
-            "currency": "USD",
-            "exchange": "",
-            "regularMarketPrice": 195.00,
-        }
-        mock_yf.Ticker.return_value = mock_ticker
-
-        service = YahooFinanceService()
-        result = service.search_by_isin("US0378331005")
+    @pytest.mark.parametrize(
+        ("isin", "quote", "info", "field", "expected"),
+        [
+            # ETF quote type
+            (
+                "US9229087690",
+                {"symbol": "VOO"},
+                {
+                    "quoteType": "ETF",
+                    "longName": "Vanguard S&P 500 ETF",
+                    "currency": "USD",
+                    "exchange": "NYSE ARCA",
+                },
+                "type",
+                "etf",
+            ),
+            # shortName when there is no longName
+            (
+                "US1234567881",
+                {"symbol": "TEST", "shortname": "Test Company"},
+                {"quoteType": "EQUITY", "shortName": "Test Co", "currency": "EUR", "exchange": ""},
+                "name",
+                "Test Co",
+            ),
+            # Search quote shortname when info has no name
+            (
+                "US1234567881",
+                {"symbol": "TEST", "shortname": "Fallback Name"},
+                {"quoteType": "EQUITY", "currency": "GBP"},
+                "name",
+                "Fallback Name",
+            ),
+            # Symbol when no name is available anywhere
+            (
+                "US1234567881",
+                {"symbol": "NONAME"},
+                {"quoteType": "EQUITY", "currency": "USD"},
+                "name",
+                "NONAME",
+            ),
+            # Exchange from the symbol suffix when info has none
+            (
+                "GB00B63H8491",
+                {"symbol": "RR.L"},
+                {
+                    "quoteType": "EQUITY",
+                    "longName": "Rolls-Royce",
+                    "currency": "GBP",
+                    "exchange": "",
+                },
+                "exchange",
+                "London Stock Exchange",
+            ),
+            # US default for symbols without a suffix
+            (
+                "US0378331005",
+                {"symbol": "AAPL"},
+                {"quoteType": "EQUITY", "longName": "Apple", "currency": "USD", "exchange": ""},
+                "exchange",
+                "NYSE/NASDAQ",
+            ),
+        ],
+    )
+    def test_search_by_isin_field_resolution(
+        self, mock_yf, yf_service, isin, quote, info, field, expected
+    ):
+        """Test how ISIN search resolves type, name and exchange from the available data."""
+        mock_yf.Search.return_value.quotes = [quote]
+        mock_yf.Ticker.return_value.info = {**info, "regularMarketPrice": 100.00}
+
+        result = yf_service.search_by_isin(isin)
 
         assert result is not None
-        assert result.exchange == "NYSE/NASDAQ"
+        assert getattr(result, field) == expected
 
-    @patch("src.services.yahoo_finance.yf")
-    def test_search_by_isin_exception_raised(self, mock_yf):
+    def test_search_by_isin_exception_raised(self, mock_yf, yf_service):
         """Test ISIN search raises exception on error."""
-        from src.services.yahoo_finance import YahooFinanceService
-
         mock_yf.Search.side_effect = Exception("Network timeout")
 
-        service = YahooFinanceService()
-
         with pytest.raises(Exception) as exc_info:
-            service.search_by_isin("US0378331005")
+            yf_service.search_by_isin("US0378331005")
 
         assert "Network timeout" in str(exc_info.value)
 
@@ -375,188 +398,210 @@ class TestYahooFinanceServiceSearch:
 class TestYahooFinanceServiceQuote:
     """Tests for the Yahoo Finance service get_quote method."""
 
-    @patch("src.services.yahoo_finance.yf")
-    def test_get_quote_success_with_fast_info(self, mock_yf):
+    def test_get_quote_success_with_fast_info(self, mock_yf, yf_service, make_ticker):
         """Test successful quote retrieval using fast_info."""
-        from src.services.yahoo_finance import YahooFinanceService
-
-        mock_ticker = MagicMock()
-        # fast_info is dict-like, mock .get() method
-        mock_fast_info = MagicMock()
-        mock_fast_info.get.side_effect = lambda key, default=None: {
-            "lastPrice": 195.50,
-            "currency": "USD",
-        }.get(key, default)
-        mock_ticker.fast_info = mock_fast_info
-        mock_yf.Ticker.return_value = mock_ticker
+        mock_yf.Ticker.return_value = make_ticker(
+            fast_info={
+                "lastPrice": 195.50,
+                "currency": "USD",
+            }
+        )
 
-        service = YahooFinanceService()
-        result = service.get_quote("AAPL")
+        result = yf_service.get_quote("AAPL")
 
         assert result is not None
         assert result.symbol == "AAPL"
         assert result.price == "195.5000"
         assert result.currency == "USD"
+        assert datetime.fromisoformat(result.time).tzinfo is not None
 
-    @patch("src.services.yahoo_finance.yf")
-    def test_get_quote_uses_regular_market_price(self, mock_yf):
+    def test_get_quote_uses_regular_market_price(self, mock_yf, yf_service, make_ticker):
         """Test quote uses regularMarketPrice from fast_info."""
-        from src.services.yahoo_finance import YahooFinanceService
-
-        mock_ticker = MagicMock()
-        mock_fast_info = MagicMock()
-        mock_fast_info.get.side_effect = lambda key, default=None: {
-            "lastPrice": None,  # No lastPrice
-            "regularMarketPrice": 100.25,
-            "currency": "EUR",
-        }.get(key, default)
-        mock_ticker.fast_info = mock_fast_info
-        mock_yf.Ticker.return_value = mock_ticker
+        mock_yf.Ticker.return_value = make_ticker(
+            fast_info={
+                "lastPrice": None,  # No lastPrice
+                "regularMarketPrice": 100.25,
+                "currency": "EUR",
+            }
+        )
 
-        service = YahooFinanceService()
-        result = service.get_quote("BMW.DE")
+        result = yf_service.get_quote("BMW.DE")
 
         assert result is not None
         assert result.price == "100.2500"
         assert result.currency == "EUR"
 
-    @patch("src.services.yahoo_finance.yf")
-    def test_get_quote_fallback_to_info(self, mock_yf):
+    def test_get_quote_fallback_to_info(self, mock_yf, yf_service, make_ticker):
         """Test quote falls back to info when fast_info fails."""
-        from src.services.yahoo_finance import YahooFinanceService
-
-        mock_ticker = MagicMock()
-        # fast_info.get raises exception
-        mock_fast_info = MagicMock()
-        mock_fast_info.get.side_effect = Exception("fast_info error")
-        mock_ticker.fast_info = mock_fast_info
-        mock_ticker.info = {
-            "regularMarketPrice": 50.00,
-            "currency": "GBP",
-        }
-        mock_yf.Ticker.return_value = mock_ticker
-
-        service = YahooFinanceService()
-        result = service.get_quote("RR.L")
+        mock_yf.Ticker.return_value = make_ticker(
+            fast_info=Exception("fast_info error"),
+            info={
+                "regularMarketPrice": 50.00,
+                "currency": "GBP",
+            },
+        )
+
+        result = yf_service.get_quote("RR.L")
 
         assert result is not None
         assert result.price == "50.0000"
         assert result.currency == "GBP"
 
-    @patch("src.services.yahoo_finance.yf")
-    def test_get_quote_uses_current_price_fallback(self, mock_yf):
+    def test_get_quote_uses_current_price_fallback(self, mock_yf, yf_service, make_ticker):
         """Test quote uses currentPrice when regularMarketPrice not available."""
-        from src.services.yahoo_finance import YahooFinanceService
-
-        mock_ticker = MagicMock()
-        mock_fast_info = MagicMock()
-        mock_fast_info.get.side_effect = Exception("error")
-        mock_ticker.fast_info = mock_fast_info
-        mock_ticker.info = {
-            "currentPrice": 75.50,
-            "currency": "USD",
-        }
-        mock_yf.Ticker.return_value = mock_ticker
+        mock_yf.Ticker.return_value = make_ticker(
+            fast_info=Exception("error"),
+            info={
+                "currentPrice": 75.50,
+                "currency": "USD",
+            },
+        )
 
-        service = YahooFinanceService()
-        result = service.get_quote("TEST")
+        result = yf_service.get_quote("TEST")
 
         assert result is not None
         assert result.price == "75.5000"
 
-    @patch("src.services.yahoo_finance.yf")
-    def test_get_quote_no_price_data(self, mock_yf):
+    def test_get_quote_no_price_data(self, mock_yf, yf_service, make_ticker):
         """Test quote returns None when no price data available."""
-        from src.services.yahoo_finance import YahooFinanceService
-
-        mock_ticker = MagicMock()
-        mock_fast_info = MagicMock()
-        mock_fast_info.get.side_effect = Exception("error")
-        mock_ticker.fast_info = mock_fast_info
-        mock_ticker.info = {}  # No price data
-        mock_yf.Ticker.return_value = mock_ticker
+        mock_yf.Ticker.return_value = make_ticker(fast_info=Exception("error"), info={})
 
-        service = YahooFinanceService()
-        result = service.get_quote("INVALID")
+        result = yf_service.get_quote("INVALID")
 
         assert result is None
 
-    @patch("src.services.yahoo_finance.yf")
-    def test_get_quote_default_currency(self, mock_yf):
+    def test_get_quote_default_currency(self, mock_yf, yf_service, make_ticker):
         """Test quote uses USD as default currency."""
-        from src.services.yahoo_finance import YahooFinanceService
-
-        mock_ticker = MagicMock()
-        mock_fast_info = MagicMock()
-        mock_fast_info.get.side_effect = lambda key, default=None: {
-            "lastPrice": 100.00,
-        }.get(key, default)
-        mock_ticker.fast_info = mock_fast_info
-        mock_yf.Ticker.return_value = mock_ticker
+        mock_yf.Ticker.return_value = make_ticker(
+            fast_info={
+                "lastPrice": 100.00,
+            }
+        )
 
-        service = YahooFinanceService()
-        result = service.get_quote("TEST")
+        result = yf_service.get_quote("TEST")
 
         assert result is not None
         assert result.currency == "USD"
 
-    @patch("src.services.yahoo_finance.yf")
-    def test_get_quote_exception_raised(self, mock_yf):
+    def test_get_quote_exception_raised(self, mock_yf, yf_service):
         """Test quote raises exception on error."""
-        from src.services.yahoo_finance import YahooFinanceService
-
         mock_yf.Ticker.side_effect = Exception("Connection refused")
 
-        service = YahooFinanceService()
-
         with pytest.raises(Exception) as exc_info:
-            service.get_quote("AAPL")
+            yf_service.get_quote("AAPL")
 
         assert "Connection refused" in str(exc_info.value)
 
+    def test_get_quote_repairs_ghost_symbol_once(self, mock_yf, yf_service):
+        """Test an ISIN-like ghost symbol is swapped for the searched one, without looping."""
+        mock_yf.Ticker.return_value.fast_info = {"lastPrice": None}
+
+        ghost = InstrumentResponse(
+            isin="IE00BK5BQT80",
+            symbol="IE00BK5BQT80.L",
+            name="Ghost",
+            type="etf",
+            currency="USD",
+            exchange="LSE",
+        )
+
+        with patch.object(yf_service, "search_by_isin", return_value=ghost) as mock_search:
+            assert yf_service.get_quote("IE00BK5BQT80.SG") is None
+
+        mock_search.assert_called_once_with("IE00BK5BQT80")
+        assert mock_yf.Ticker.call_count == 2
+
+    def test_get_quote_memoized(self, mock_yf, yf_service):
+        """Test repeated quotes are served from memory, misses are not cached."""
+        mock_yf.Ticker.return_value.fast_info = {"lastPrice": 150.0, "currency": "USD"}
+
+        first = yf_service.get_quote("AAPL")
+        assert yf_service.get_quote("AAPL") is first
+        assert mock_yf.Ticker.call_count == 1
+
+        mock_yf.Ticker.return_value.fast_info = {"lastPrice": None}
+        assert yf_service.get_quote("MISSING") is None
+        assert yf_service.get_quote("MISSING") is None
+        assert mock_yf.Ticker.call_count == 3
+
+    def test_get_quote_circuit_breaker(self, mock_yf, yf_service):
+        """Test repeated upstream failures short-circuit further quote calls."""
+        mock_yf.Ticker.side_effect = curl_exceptions.ConnectionError("Connection refused")
+
+        for _ in range(yf_service.QUOTE_FAILURE_THRESHOLD):
+            with pytest.raises(curl_exceptions.ConnectionError, match="Connection refused"):
+                yf_service.get_quote("AAPL")
+
+        with pytest.raises(RuntimeError, match="temporarily unavailable"):
+            yf_service.get_quote("AAPL")
+        assert mock_yf.Ticker.call_count == yf_service.QUOTE_FAILURE_THRESHOLD
+
+    @pytest.mark.parametrize(
+        ("error", "trips"),
+        [
+            (curl_exceptions.HTTPError("503", response=SimpleNamespace(status_code=503)), True),
+            (curl_exceptions.HTTPError("429", response=SimpleNamespace(status_code=429)), True),
+            (curl_exceptions.HTTPError("404", response=SimpleNamespace(status_code=404)), False),
+            (KeyError("lastPrice"), False),
+        ],
+    )
+    def test_get_quote_circuit_breaker_ignores_bad_symbols(self, mock_yf, yf_service, error, trips):
+        """Test only upstream failures count towards the breaker, not unknown tickers."""
+        mock_yf.Ticker.side_effect = error
+
+        for index in range(yf_service.QUOTE_FAILURE_THRESHOLD):
+            with pytest.raises(type(error)):
+                yf_service.get_quote(f"BAD{index}")
+
+        assert (yf_service.quote_blocked_until is not None) is trips
+
+
+_EXCHANGE_CASES = [
+    ("RR.L", "London Stock Exchange"),
+    ("BMW.DE", "Deutsche Börse"),
+    ("AIR.PA", "Euronext Paris"),
+    ("ASML.AS", "Euronext Amsterdam"),
+    ("TEST.BR", "Euronext Brussels"),
+    ("ENI.MI", "Borsa Italiana"),
+    ("TEF.MC", "Bolsa de Madrid"),
+    ("NESN.SW", "SIX Swiss Exchange"),
+    ("TD.TO", "Toronto Stock Exchange"),
+    ("TEST.V", "TSX Venture Exchange"),
+    ("BHP.AX", "Australian Securities Exchange"),
+    ("0941.HK", "Hong Kong Stock Exchange"),
+    ("7203.T", "Tokyo Stock Exchange"),
+    ("600000.SS", "Shanghai Stock Exchange"),
+    ("000001.SZ", "Shenzhen Stock Exchange"),
+    ("AAPL", "NYSE/NASDAQ"),  # No suffix
+    ("TEST.XX", "XX"),  # Unknown suffix
+]
+
 
 class TestYahooFinanceServiceExchange:
     """Tests for the Yahoo Finance service exchange extraction."""
 
-    def test_extract_exchange_all_mappings(self):
+    @pytest.mark.parametrize(
+        ("symbol", "expected_exchange"), _EXCHANGE_CASES, ids=[c[0] for c in _EXCHANGE_CASES]
+    )
+    def test_extract_exchange_all_mappings(self, yf_service, symbol, expected_exchange):
         """Test exchange extraction for all known suffixes."""
-        from src.services.yahoo_finance import YahooFinanceService
-
-        service = YahooFinanceService()
-
-        # Test all exchange mappings
-        test_cases = [
-            ("RR.L", {}, "London Stock Exchange"),
-            ("BMW.DE", {}, "Deutsche Börse"),
-            ("AIR.PA", {}, "Euronext Paris"),
-            ("ASML.AS", {}, "Euronext Amsterdam"),
-            ("TEST.BR", {}, "Euronext Brussels"),
-            ("ENI.MI", {}, "Borsa Italiana"),
-            ("TEF.MC", {}, "Bolsa de Madrid"),
-            ("NESN.SW", {}, "SIX Swiss Exchange"),
-            ("TD.TO", {}, "Toronto Stock Exchange"),
-            ("TEST.V", {}, "TSX Venture Exchange"),
-            ("BHP.AX", {}, "Australian Securities Exchange"),
-            ("0941.HK", {}, "Hong Kong Stock Exchange"),
-            ("7203.T", {}, "Tokyo Stock Exchange"),
-            ("600000.SS", {}, "Shanghai Stock Exchange"),
-            ("000001.SZ", {}, "Shenzhen Stock Exchange"),
-            ("AAPL", {}, "NYSE/NASDAQ"),  # No suffix
-            ("TEST.XX", {}, "XX"),  # Unknown suffix
-        ]
-
-        for symbol, info, expected_exchange in test_cases:
-            result = service._extract_exchange(symbol, info)
-            assert result == expected_exchange, f"Failed for {symbol}"
-
-    def test_extract_exchange_from_info(self):
+        assert yf_service._extract_exchange(symbol, {}) == expected_exchange
+
+    def test_extract_exchange_from_info(self, yf_service):
         """Test exchange extraction prioritizes info over symbol."""
-        from src.services.yahoo_finance import YahooFinanceService
+        result = yf_service._extract_exchange("RR.L", {"exchange": "LSE"})
+        assert result == "LSE"
 
-        service = YahooFinanceService()
 
-        result = service._extract_exchange("RR.L", {"exchange": "LSE"})
-        assert result == "LSE"
+class TestResponses:
+    """Tests for custom response classes."""
+
+    def test_orjson_response_render(self):
+        """Test ORJSONResponse renders compact JSON bytes."""
+        response = ORJSONResponse(content={"symbol": "AAPL", "price": "195.5000"})
+
+        assert response.body == b'{"symbol":"AAPL","price":"195.5000"}'
+        assert response.media_type == "application/json"
 
 
 class TestConfig:
@@ -578,14 +623,55 @@ class TestConfig:
 
         assert settings.debug is False
 
+    def test_get_settings_is_cached(self):
+        """Test settings are built once and shared across callers."""
+        from src.config import get_settings, settings
+
+        assert get_settings() is get_settings()
+        assert settings is get_settings()
+
+    def test_docs_and_cors_can_be_disabled(self, monkeypatch):
+        """Test ENABLE_DOCS/ENABLE_CORS=false drop the docs routes and CORS middleware."""
+        from src.config import get_settings
+        from src.main import create_app
+
+        monkeypatch.setenv("ENABLE_DOCS", "false")
+        monkeypatch.setenv("ENABLE_CORS", "false")
+        get_settings.cache_clear()
+        try:
+            prod_app = create_app()
+            prod_client = TestClient(prod_app)
+
+            assert prod_client.get("/docs").status_code == 404
+            assert prod_client.get("/openapi.json").status_code == 404
+            assert prod_client.get("/").json()["docs"] is None
+            assert prod_app.user_middleware == []
+        finally:
+            monkeypatch.undo()
+            get_settings.cache_clear()
+
+    def test_settings_are_frozen(self):
+        """Test the shared settings instance cannot be mutated."""
+        from pydantic import ValidationError
+
+        from src.config import get_settings
+
+        with pytest.raises(ValidationError):
+            get_settings().debug = True
+
+    def test_config_unknown_attribute(self):
+        """Test unknown module attributes still raise AttributeError."""
+        import src.config
+
+        with pytest.raises(AttributeError):
+            _ = src.config.missing_setting
+
 
 class TestSchemas:
     """Tests for Pydantic schemas."""
 
     def test_instrument_response_creation(self):
         """Test InstrumentResponse model creation."""
-        from src.models.schemas import InstrumentResponse
-
         instrument = InstrumentResponse(
             isin="US0378331005",
             symbol="AAPL",
@@ -600,8 +686,6 @@ class TestSchemas:
 
     def test_quote_response_creation(self):
         """Test QuoteResponse model creation."""
-        from src.models.schemas import QuoteResponse
-
         quote = QuoteResponse(
             symbol="AAPL",
             price="195.50",
@@ -614,8 +698,6 @@ class TestSchemas:
 
     def test_health_response_creation(self):
         """Test HealthResponse model creation."""
-        from src.models.schemas import HealthResponse
-
         health = HealthResponse(status="healthy", version="1.0.0")
 
         assert health.status == "healthy"
@@ -623,8 +705,6 @@ class TestSchemas:
 
     def test_error_response_creation(self):
         """Test ErrorResponse model creation."""
-        from src.models.schemas import ErrorResponse
-
         error = ErrorResponse(error="Not found", detail="Resource not found")
 
         assert error.error == "Not found"
@@ -632,390 +712,248 @@ class TestSchemas:
 
     def test_error_response_optional_detail(self):
         """Test ErrorResponse with optional detail."""
-        from src.models.schemas import ErrorResponse
-
         error = ErrorResponse(error="Server error")
 
         assert error.error == "Server error"
         assert error.detail is None
 
 
+_APPLE = InstrumentResponse(
+    isin="US0378331005",
+    symbol="AAPL",
+    name="Apple Inc.",
+    type="stock",
+    currency="USD",
+    exchange="NASDAQ",
+)
+_SAP = InstrumentResponse(
+    isin="DE0007164600",
+    symbol="SAP",
+    name="SAP SE",
+    type="stock",
+    currency="EUR",
+    exchange="XETRA",
+)
+_AAPL_QUOTE = QuoteResponse(
+    symbol="AAPL", price="193.4200", currency="USD", time="2025-12-26T10:30:00Z"
+)
+_SAP_QUOTE = QuoteResponse(
+    symbol="SAP", price="142.5000", currency="EUR", time="2025-12-26T10:30:00Z"
+)
+
+
 class TestBatchSearchEndpoint:
     """Tests for the batch search endpoint."""
 
-    @patch("src.routes.search.yahoo_finance_service")
-    def test_batch_search_success(self, mock_service):
-        """Test successful batch ISIN search."""
-        from src.models.schemas import InstrumentResponse
-
-        # Mock the async method
-        async def mock_batch_search(isins):
-            return (
-                [
-                    InstrumentResponse(
-                        isin="US0378331005",
-                        symbol="AAPL",
-                        name="Apple Inc.",
-                        type="stock",
-                        currency="USD",
-                        exchange="NASDAQ",
-                    ),
-                    InstrumentResponse(
-                        isin="DE0007164600",
-                        symbol="SAP",
-                        name="SAP SE",
-                        type="stock",
-                        currency="EUR",
-                        exchange="XETRA",
-                    ),
-                ],
+    @pytest.mark.parametrize(
+        ("isins", "outcome", "expected_isins", "expected_errors"),
+        [
+            # All found
+            (
+                ["US0378331005", "DE0007164600"],
+                ([_APPLE, _SAP], []),
+                ["US0378331005", "DE0007164600"],
                 [],
-            )
-
-        mock_service.batch_search_by_isins = mock_batch_search
-
-        response = client.post(
-            "/api/v1/search/batch",
-            json={"isins": ["US0378331005", "DE0007164600"]},
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data["results"]) == 2
-        assert len(data["errors"]) == 0
-        assert data["results"][0]["isin"] == "US0378331005"
-        assert data["results"][1]["isin"] == "DE0007164600"
-
-    @patch("src.routes.search.yahoo_finance_service")
-    def test_batch_search_partial_errors(self, mock_service):
-        """Test batch search with some ISINs not found."""
-        from src.models.schemas import InstrumentResponse
-
-        async def mock_batch_search(isins):
-            return (
-                [
-                    InstrumentResponse(
-                        isin="US0378331005",
-                        symbol="AAPL",
-                        name="Apple Inc.",
-                        type="stock",
-                        currency="USD",
-                        exchange="NASDAQ",
-                    ),
-                ],
-                [("US1234567891", "No instrument found for ISIN")],
-            )
-
-        mock_service.batch_search_by_isins = mock_batch_search
-
-        response = client.post(
-            "/api/v1/search/batch",
-            json={"isins": ["US0378331005", "US1234567891"]},
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data["results"]) == 1
-        assert len(data["errors"]) == 1
-        assert data["errors"][0]["isin"] == "US1234567891"
-        assert "No instrument found" in data["errors"][0]["error"]
-
-    @patch("src.routes.search.yahoo_finance_service")
-    def test_batch_search_all_errors(self, mock_service):
-        """Test batch search when all ISINs fail."""
-
-        async def mock_batch_search(isins):
-            return (
+            ),
+            # Some ISINs not found
+            (
+                ["US0378331005", "US1234567891"],
+                ([_APPLE], [("US1234567891", "No instrument found for ISIN")]),
+                ["US0378331005"],
+                ["US1234567891"],
+            ),
+            # All ISINs fail
+            (
+                ["US1234567892", "US1234567893"],
+                (
+                    [],
+                    [
+                        ("US1234567892", "No instrument found for ISIN"),
+                        ("US1234567893", "No instrument found for ISIN"),
+                    ],
+                ),
                 [],
-                [
-                    ("US1234567892", "No instrument found for ISIN"),
-                    ("US1234567893", "No instrument found for ISIN"),
-                ],
-            )
+                ["US1234567892", "US1234567893"],
+            ),
+        ],
+    )
+    async def test_batch_search(
+        self, mock_search_service, aclient, isins, outcome, expected_isins, expected_errors
+    ):
+        """Test batch ISIN search splits results and per-ISIN errors."""
+        mock_search_service.batch_search_by_isins = AsyncMock(return_value=outcome)
 
-        mock_service.batch_search_by_isins = mock_batch_search
+        response = await aclient.post("/api/v1/search/batch", json={"isins": isins})
 
-        response = client.post(
-            "/api/v1/search/batch",
-            json={"isins": ["US1234567892", "US1234567893"]},
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data["results"]) == 0
-        assert len(data["errors"]) == 2
-
-    @patch("src.routes.search.yahoo_finance_service")
-    def test_batch_search_service_error(self, mock_service):
-        """Test batch search when service throws an exception."""
-
-        async def mock_batch_search(isins):
-            raise Exception("Service unavailable")
-
-        mock_service.batch_search_by_isins = mock_batch_search
-
-        response = client.post(
-            "/api/v1/search/batch",
-            json={"isins": ["US0378331005"]},
-        )
-
-        assert response.status_code == 500
-        data = response.json()
-        assert "Service unavailable" in data["detail"]
+        data = assert_json(response, 200)
+        assert [result["isin"] for result in data["results"]] == expected_isins
+        assert [error["isin"] for error in data["errors"]] == expected_errors
+        for error in data["errors"]:
+            assert "No instrument found" in error["error"]
 
 
 class TestBatchQuoteEndpoint:
     """Tests for the batch quote endpoint."""
 
-    @patch("src.routes.quote.yahoo_finance_service")
-    def test_batch_quote_success(self, mock_service):
-        """Test successful batch quote retrieval."""
-        from src.models.schemas import QuoteResponse
-
-        async def mock_batch_quotes(symbols):
-            return (
-                [
-                    QuoteResponse(
-                        symbol="AAPL",
-                        price="193.4200",
-                        currency="USD",
-                        time="2025-12-26T10:30:00Z",
-                    ),
-                    QuoteResponse(
-                        symbol="SAP",
-                        price="142.5000",
-                        currency="EUR",
-                        time="2025-12-26T10:30:00Z",
-                    ),
-                ],
+    @pytest.mark.parametrize(
+        ("symbols", "outcome", "expected_symbols", "expected_errors"),
+        [
+            # All found
+            (["AAPL", "SAP"], ([_AAPL_QUOTE, _SAP_QUOTE], []), ["AAPL", "SAP"], []),
+            # Some symbols not found
+            (
+                ["AAPL", "RR.L"],
+                ([_AAPL_QUOTE], [("RR.L", "No quote data available")]),
+                ["AAPL"],
+                ["RR.L"],
+            ),
+            # All symbols fail
+            (
+                ["US1234567892", "US1234567893"],
+                (
+                    [],
+                    [
+                        ("US1234567892", "No quote data available"),
+                        ("US1234567893", "No quote data available"),
+                    ],
+                ),
                 [],
-            )
-
-        mock_service.batch_get_quotes = mock_batch_quotes
-
-        response = client.post(
-            "/api/v1/quote/batch",
-            json={"symbols": ["AAPL", "SAP"]},
+                ["US1234567892", "US1234567893"],
+            ),
+        ],
+    )
+    async def test_batch_quote(
+        self, mock_quote_service, aclient, symbols, outcome, expected_symbols, expected_errors
+    ):
+        """Test batch quote retrieval splits results and per-symbol errors."""
+        mock_quote_service.batch_get_quotes = AsyncMock(return_value=outcome)
+
+        response = await aclient.post("/api/v1/quote/batch", json={"symbols": symbols})
+
+        data = assert_json(response, 200)
+        assert [result["symbol"] for result in data["results"]] == expected_symbols
+        assert [error["symbol"] for error in data["errors"]] == expected_errors
+        for error in data["errors"]:
+            assert "No quote data available" in error["error"]
+
+
+class TestServiceErrors:
+    """Service failures become a generic 500 on every endpoint."""
+
+    @pytest.mark.parametrize(
+        ("module", "method", "mock_class", "http_method", "url", "payload"),
+        [
+            ("search", "search_by_isin", MagicMock, "get", "/api/v1/search/US0378331005", None),
+            ("quote", "get_quote", MagicMock, "get", "/api/v1/quote/AAPL", None),
+            (
+                "search",
+                "batch_search_by_isins",
+                AsyncMock,
+                "post",
+                "/api/v1/search/batch",
+                {"isins": ["US0378331005"]},
+            ),
+            (
+                "quote",
+                "batch_get_quotes",
+                AsyncMock,
+                "post",
+                "/api/v1/quote/batch",
+                {"symbols": ["AAPL"]},
+            ),
+        ],
+    )
+    def test_service_error_returns_generic_500(
+        self, monkeypatch, client, module, method, mock_class, http_method, url, payload
+    ):
+        """Test the exception message never reaches the client."""
+        monkeypatch.setattr(
+            f"src.routes.{module}.yahoo_finance_service.{method}",
+            mock_class(side_effect=Exception("Upstream exploded")),
         )
 
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data["results"]) == 2
-        assert len(data["errors"]) == 0
-        assert data["results"][0]["symbol"] == "AAPL"
-        assert data["results"][1]["symbol"] == "SAP"
-
-    @patch("src.routes.quote.yahoo_finance_service")
-    def test_batch_quote_partial_errors(self, mock_service):
-        """Test batch quote with some symbols not found."""
-        from src.models.schemas import QuoteResponse
-
-        async def mock_batch_quotes(symbols):
-            return (
-                [
-                    QuoteResponse(
-                        symbol="AAPL",
-                        price="193.4200",
-                        currency="USD",
-                        time="2025-12-26T10:30:00Z",
-                    ),
-                ],
-                [("RR.L", "No quote data available")],
-            )
+        response = client.request(http_method, url, json=payload)
 
-        mock_service.batch_get_quotes = mock_batch_quotes
-
-        response = client.post(
-            "/api/v1/quote/batch",
-            json={"symbols": ["AAPL", "RR.L"]},
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data["results"]) == 1
-        assert len(data["errors"]) == 1
-        assert data["errors"][0]["symbol"] == "RR.L"
-        assert "No quote data available" in data["errors"][0]["error"]
-
-    @patch("src.routes.quote.yahoo_finance_service")
-    def test_batch_quote_all_errors(self, mock_service):
-        """Test batch quote when all symbols fail."""
-
-        async def mock_batch_quotes(symbols):
-            return (
-                [],
-                [
-                    ("US1234567892", "No quote data available"),
-                    ("US1234567893", "No quote data available"),
-                ],
-            )
-
-        mock_service.batch_get_quotes = mock_batch_quotes
-
-        response = client.post(
-            "/api/v1/quote/batch",
-            json={"symbols": ["US1234567892", "US1234567893"]},
-        )
-
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data["results"]) == 0
-        assert len(data["errors"]) == 2
-
-    @patch("src.routes.quote.yahoo_finance_service")
-    def test_batch_quote_service_error(self, mock_service):
-        """Test batch quote when service throws an exception."""
-
-        async def mock_batch_quotes(symbols):
-            raise Exception("Network timeout")
-
-        mock_service.batch_get_quotes = mock_batch_quotes
-
-        response = client.post(
-            "/api/v1/quote/batch",
-            json={"symbols": ["AAPL"]},
-        )
-
-        assert response.status_code == 500
-        data = response.json()
-        assert "Network timeout" in data["detail"]
+        data = assert_json(response, 500)
+        assert data["detail"] == "Internal server error"
+        assert "Upstream exploded" not in response.text
 
 
 class TestBatchServiceMethods:
     """Tests for the batch methods in Yahoo Finance service."""
 
-    @pytest.mark.asyncio
-    @patch("src.services.yahoo_finance.justetf_provider")
-    @patch("src.services.yahoo_finance.yf")
-    async def test_batch_search_by_isins_success(self, mock_yf, mock_justetf):
+    async def test_batch_search_by_isins_success(
+        self, mock_justetf, mock_yf, yf_service, make_ticker
+    ):
         """Test batch search service method with successful results."""
-        from src.services.yahoo_finance import YahooFinanceService
+        mock_yf.Search.return_value = SimpleNamespace(
+            quotes=[{"symbol": "AAPL", "shortname": "Apple Inc"}]
+        )
+        mock_yf.Ticker.return_value = make_ticker(info=equity_info())
 
-        # Mock Search result
-        mock_search = MagicMock()
-        mock_search.quotes = [{"symbol": "AAPL", "shortname": "Apple Inc"}]
-        mock_yf.Search.return_value = mock_search
-
-        # Mock Ticker info with price
-        mock_ticker = MagicMock()
-        mock_ticker.info = {
-            "quoteType": "EQUITY",
-            "longName": "Apple Inc.",
-            "currency": "USD",
-            "exchange": "NASDAQ",
-            "regularMarketPrice": 195.50,
-        }
-        mock_yf.Ticker.return_value = mock_ticker
-
-        service = YahooFinanceService()
-        results, errors = await service.batch_search_by_isins(["US0378331005"])
+        results, errors = await yf_service.batch_search_by_isins(["US0378331005"])
 
         assert len(results) == 1
         assert len(errors) == 0
         assert results[0].isin == "US0378331005"
 
-    @pytest.mark.asyncio
-    @patch("src.services.yahoo_finance.justetf_provider")
-    @patch("src.services.yahoo_finance.yf")
-    async def test_batch_search_by_isins_partial_failure(self, mock_yf, mock_justetf):
+    async def test_batch_search_by_isins_partial_failure(
+        self, mock_justetf, mock_yf, yf_service, make_ticker
+    ):
         """Test batch search service method with partial failures."""
-        from src.services.yahoo_finance import YahooFinanceService
-
-        # Mock Search to return results for first, empty for second
-        def search_side_effect(isin):
-            mock = MagicMock()
-            if isin == "US0378331005":
-                mock.quotes = [{"symbol": "AAPL"}]
-            else:
-                mock.quotes = []
-            return mock
-
-        mock_yf.Search.side_effect = search_side_effect
+
+        # Search finds the first ISIN only
+        searches = {"US0378331005": SimpleNamespace(quotes=[{"symbol": "AAPL"}])}
+        no_results = SimpleNamespace(quotes=[])
+        mock_yf.Search.side_effect = lambda isin: searches.get(isin, no_results)
         mock_justetf.search_by_isin.return_value = None
 
-        # Mock Ticker with price
-        mock_ticker = MagicMock()
-        mock_ticker.info = {
-            "quoteType": "EQUITY",
-            "longName": "Apple Inc.",
-            "currency": "USD",
-            "exchange": "NASDAQ",
-            "regularMarketPrice": 195.50,
-        }
-        mock_yf.Ticker.return_value = mock_ticker
+        mock_yf.Ticker.return_value = make_ticker(info=equity_info())
 
-        service = YahooFinanceService()
-        results, errors = await service.batch_search_by_isins(["US0378331005", "INVALID"])
+        results, errors = await yf_service.batch_search_by_isins(["US0378331005", "INVALID"])
 
         assert len(results) == 1
         assert len(errors) == 1
         assert errors[0][0] == "INVALID"
 
-    @pytest.mark.asyncio
-    @patch("src.services.yahoo_finance.yf")
-    async def test_batch_get_quotes_success(self, mock_yf):
+    async def test_batch_get_quotes_success(self, mock_yf, yf_service, make_ticker):
         """Test batch quote service method with successful results."""
-        from src.services.yahoo_finance import YahooFinanceService
-
-        mock_ticker = MagicMock()
-        mock_fast_info = MagicMock()
-        mock_fast_info.get.side_effect = lambda key, default=None: {
-            "lastPrice": 195.50,
-            "currency": "USD",
-        }.get(key, default)
-        mock_ticker.fast_info = mock_fast_info
-        mock_yf.Ticker.return_value = mock_ticker
+        mock_yf.Ticker.return_value = make_ticker(
+            fast_info={
+                "lastPrice": 195.50,
+                "currency": "USD",
+            }
+        )
 
-        service = YahooFinanceService()
-        results, errors = await service.batch_get_quotes(["AAPL"])
+        results, errors = await yf_service.batch_get_quotes(["AAPL"])
 
         assert len(results) == 1
         assert len(errors) == 0
         assert results[0].symbol == "AAPL"
 
-    @pytest.mark.asyncio
-    @patch("src.services.yahoo_finance.yf")
-    async def test_batch_get_quotes_partial_failure(self, mock_yf):
+    async def test_batch_get_quotes_partial_failure(self, mock_yf, yf_service, make_ticker):
         """Test batch quote service method with partial failures."""
-        from src.services.yahoo_finance import YahooFinanceService
 
         def ticker_side_effect(symbol):
-            mock_ticker = MagicMock()
             if symbol == "AAPL":
-                mock_fast_info = MagicMock()
-                mock_fast_info.get.side_effect = lambda key, default=None: {
-                    "lastPrice": 195.50,
-                    "currency": "USD",
-                }.get(key, default)
-                mock_ticker.fast_info = mock_fast_info
-            else:
-                # For invalid symbol, fast_info fails
-                mock_fast_info = MagicMock()
-                mock_fast_info.get.side_effect = Exception("Not found")
-                mock_ticker.fast_info = mock_fast_info
-                mock_ticker.info = {}  # No price data
-            return mock_ticker
+                return make_ticker(fast_info={"lastPrice": 195.50, "currency": "USD"})
+            # For invalid symbol, fast_info fails and info has no price data
+            return make_ticker(fast_info=Exception("Not found"))
 
         mock_yf.Ticker.side_effect = ticker_side_effect
 
-        service = YahooFinanceService()
-        results, errors = await service.batch_get_quotes(["AAPL", "INVALID"])
+        results, errors = await yf_service.batch_get_quotes(["AAPL", "INVALID"])
 
         assert len(results) == 1
         assert len(errors) == 1
         assert errors[0][0] == "INVALID"
 
-    @pytest.mark.asyncio
-    @patch("src.services.yahoo_finance.yf")
-    async def test_batch_search_by_isins_exception_in_search(self, mock_yf):
+    async def test_batch_search_by_isins_exception_in_search(self, mock_yf, yf_service):
         """Test batch search handles exceptions thrown by search_by_isin."""
-        from src.services.yahoo_finance import YahooFinanceService
-
         # Mock Search to raise an exception
         mock_yf.Search.side_effect = Exception("Network timeout")
 
-        service = YahooFinanceService()
-        results, errors = await service.batch_search_by_isins(["US0378331005"])
+        results, errors = await yf_service.batch_search_by_isins(["US0378331005"])
 
         # Exception should be caught and added to errors
         assert len(results) == 0
@@ -1023,17 +961,12 @@ class TestBatchServiceMethods:
         assert errors[0][0] == "US0378331005"
         assert "Network timeout" in errors[0][1]
 
-    @pytest.mark.asyncio
-    @patch("src.services.yahoo_finance.yf")
-    async def test_batch_get_quotes_exception_in_get_quote(self, mock_yf):
+    async def test_batch_get_quotes_exception_in_get_quote(self, mock_yf, yf_service):
         """Test batch quotes handles exceptions thrown by get_quote."""
-        from src.services.yahoo_finance import YahooFinanceService
-
         # Mock Ticker to raise an exception
         mock_yf.Ticker.side_effect = Exception("Connection refused")
 
-        service = YahooFinanceService()
-        results, errors = await service.batch_get_quotes(["AAPL"])
+        results, errors = await yf_service.batch_get_quotes(["AAPL"])
 
         # Exception should be caught and added to errors
         assert len(results) == 0
@@ -1045,32 +978,21 @@ class TestBatchServiceMethods:
 class TestBatchSchemas:
     """Tests for batch Pydantic schemas."""
 
-    def test_batch_search_request_creation(self):
-        """Test BatchSearchRequest model creation."""
-        from src.models.schemas import BatchSearchRequest
-
-        request = BatchSearchRequest(isins=["US0378331005", "DE0007164600"])
-
-        assert len(request.isins) == 2
-        assert request.isins[0] == "US0378331005"
-
-    def test_batch_quote_request_creation(self):
-        """Test BatchQuoteRequest model creation."""
-        from src.models.schemas import BatchQuoteRequest
-
-        request = BatchQuoteRequest(symbols=["AAPL", "SAP"])
-
-        assert len(request.symbols) == 2
-        assert request.symbols[0] == "AAPL"
+    @pytest.mark.parametrize(
+        ("model_cls", "fields"),
+        [
+            (BatchSearchRequest, {"isins": ["US0378331005", "DE0007164600"]}),
+            (BatchQuoteRequest, {"symbols": ["AAPL", "SAP"]}),
+            (SearchErrorItem, {"isin": "INVALID", "error": "Not found"}),
+            (QuoteErrorItem, {"symbol": "INVALID", "error": "No data"}),
+        ],
+    )
+    def test_flat_model_creation(self, model_cls, fields):
+        """Test request and error-item models keep the fields they are built with."""
+        assert model_cls(**fields).model_dump() == fields
 
     def test_batch_search_response_creation(self):
         """Test BatchSearchResponse model creation."""
-        from src.models.schemas import (
-            BatchSearchResponse,
-            InstrumentResponse,
-            SearchErrorItem,
-        )
-
         response = BatchSearchResponse(
             results=[
                 InstrumentResponse(
@@ -1090,12 +1012,6 @@ class TestBatchSchemas:
 
     def test_batch_quote_response_creation(self):
         """Test BatchQuoteResponse model creation."""
-        from src.models.schemas import (
-            BatchQuoteResponse,
-            QuoteErrorItem,
-            QuoteResponse,
-        )
-
         response = BatchQuoteResponse(
             results=[
                 QuoteResponse(
@@ -1111,24 +1027,6 @@ class TestBatchSchemas:
         assert len(response.results) == 1
         assert len(response.errors) == 1
 
-    def test_search_error_item_creation(self):
-        """Test SearchErrorItem model creation."""
-        from src.models.schemas import SearchErrorItem
-
-        error = SearchErrorItem(isin="INVALID", error="Not found")
-
-        assert error.isin == "INVALID"
-        assert error.error == "Not found"
-
-    def test_quote_error_item_creation(self):
-        """Test QuoteErrorItem model creation."""
-        from src.models.schemas import QuoteErrorItem
-
-        error = QuoteErrorItem(symbol="INVALID", error="No data")
-
-        assert error.symbol == "INVALID"
-        assert error.error == "No data"
-
 
 class TestFallbackProviders:
     """Tests for the fallback providers module."""
@@ -1138,15 +1036,11 @@ class TestFallbackProviders:
         """Test successful justETF search."""
 
         # Mock response with ticker in HTML
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = '<html><h1>Test ETF Name</h1><script>{"ticker": "NATO"}</script><div>XETRA</div><span>EUR</span></html>'
-        mock_response.raise_for_status = MagicMock()
-        mock_session.get.return_value = mock_response
-
-        from src.services.fallback_providers import justetf_provider as provider
+        mock_session.get.return_value = html_response(
+            '<html><h1>Test ETF Name</h1><script>{"ticker": "NATO"}</script><div>XETRA</div><span>EUR</span></html>'
+        )
 
-        result = provider.search_by_isin("US1234567891")
+        result = justetf_provider.search_by_isin("US1234567891")
 
         assert result is not None
         assert result.symbol == "NATO.DE"
@@ -1156,15 +1050,9 @@ class TestFallbackProviders:
     def test_justetf_search_no_ticker(self, mock_session):
         """Test justETF search when no ticker found."""
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = "<html><h1>Page</h1></html>"
-        mock_response.raise_for_status = MagicMock()
-        mock_session.get.return_value = mock_response
+        mock_session.get.return_value = html_response("<html><h1>Page</h1></html>")
 
-        from src.services.fallback_providers import justetf_provider as provider
-
-        result = provider.search_by_isin("US1234567891")
+        result = justetf_provider.search_by_isin("US1234567891")
 
         assert result is None
 
@@ -1174,25 +1062,18 @@ class TestFallbackProviders:
 
         mock_session.get.side_effect = Exception("Connection error")
 
-        from src.services.fallback_providers import justetf_provider as provider
-
-        result = provider.search_by_isin("US1234567891")
-
-        assert result is None
+        with pytest.raises(ProviderUnavailableError):
+            justetf_provider.search_by_isin("US1234567891")
 
     @patch("src.services.fallback_providers.justetf_provider.session")
     def test_justetf_extract_exchange_london(self, mock_session):
         """Test justETF extracts London Stock Exchange."""
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = '<html><h1>Test ETF</h1><script>{"ticker": "TEST"}</script><div>London Stock Exchange</div><span>GBP</span></html>'
-        mock_response.raise_for_status = MagicMock()
-        mock_session.get.return_value = mock_response
-
-        from src.services.fallback_providers import justetf_provider as provider
+        mock_session.get.return_value = html_response(
+            '<html><h1>Test ETF</h1><script>{"ticker": "TEST"}</script><div>London Stock Exchange</div><span>GBP</span></html>'
+        )
 
-        result = provider.search_by_isin("GB1234567890")
+        result = justetf_provider.search_by_isin("GB1234567890")
 
         assert result is not None
         assert result.symbol == "TEST.L"
@@ -1202,17 +1083,11 @@ class TestFallbackProviders:
     def test_justetf_extract_name_from_title(self, mock_session):
         """Test justETF extracts name from title when no h1."""
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = (
+        mock_session.get.return_value = html_response(
             '<html><title>My ETF | justETF</title><script>{"ticker": "TEST"}</script></html>'
         )
-        mock_response.raise_for_status = MagicMock()
-        mock_session.get.return_value = mock_response
-
-        from src.services.fallback_providers import justetf_provider as provider
 
-        result = provider.search_by_isin("IE00BK5BQT80")
+        result = justetf_provider.search_by_isin("IE00BK5BQT80")
 
         assert result is not None
         assert result.name == "My ETF"
@@ -1221,52 +1096,38 @@ class TestFallbackProviders:
     def test_justetf_default_suffix_when_no_exchange(self, mock_session):
         """Test justETF uses default .L suffix when no exchange found."""
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = '<html><h1>Unknown ETF</h1><script>{"ticker": "UNK"}</script></html>'
-        mock_response.raise_for_status = MagicMock()
-        mock_session.get.return_value = mock_response
-
-        from src.services.fallback_providers import justetf_provider as provider
+        mock_session.get.return_value = html_response(
+            '<html><h1>Unknown ETF</h1><script>{"ticker": "UNK"}</script></html>'
+        )
 
-        result = provider.search_by_isin("IE00BK5BQT80")
+        result = justetf_provider.search_by_isin("IE00BK5BQT80")
 
         assert result is not None
         assert result.symbol == "UNK.L"
 
     @patch("src.services.fallback_providers.justetf_provider.session.get")
-    @patch("src.services.fallback_providers.BeautifulSoup")
-    def test_justetf_search_generic_exception(self, mock_bs, mock_get):
+    @patch("src.services.fallback_providers.document_fromstring")
+    def test_justetf_search_generic_exception(self, mock_parse, mock_get):
         """Test justETF search when a generic exception occurs during parsing."""
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status = MagicMock()
-        mock_get.return_value = mock_response
+        mock_get.return_value = html_response()
 
-        # Force BeautifulSoup to raise a generic Exception
-        mock_bs.side_effect = Exception("Parsing error")
+        # Force the HTML parser to raise a generic Exception
+        mock_parse.side_effect = Exception("Parsing error")
 
-        from src.services.fallback_providers import justetf_provider as provider
-
-        result = provider.search_by_isin("IE00BK5BQT80")
-
-        assert result is None
+        with pytest.raises(ProviderUnavailableError):
+            justetf_provider.search_by_isin("IE00BK5BQT80")
 
     @patch("src.services.fallback_providers.justetf_provider.session")
     def test_justetf_extract_name_none(self, mock_session):
         """Test justETF extraction when no name can be found (no h1 or title)."""
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
         # HTML with no H1 and no TITLE
-        mock_response.text = '<html><body><script>{"ticker": "NATO"}</script></body></html>'
-        mock_response.raise_for_status = MagicMock()
-        mock_session.get.return_value = mock_response
-
-        from src.services.fallback_providers import justetf_provider as provider
+        mock_session.get.return_value = html_response(
+            '<html><body><script>{"ticker": "NATO"}</script></body></html>'
+        )
 
-        result = provider.search_by_isin("US1234567891")
+        result = justetf_provider.search_by_isin("US1234567891")
 
         assert result is not None
         assert result.name == "NATO"  # Falls back to ticker
@@ -1275,56 +1136,42 @@ class TestFallbackProviders:
 class TestYahooFinanceFallbackLogic:
     """Tests for Yahoo Finance fallback logic."""
 
-    @patch("src.services.yahoo_finance.justetf_provider")
-    @patch("src.services.yahoo_finance.yf")
-    def test_search_with_suffix_fallback(self, mock_yf, mock_justetf):
+    def test_search_with_suffix_fallback(self, mock_justetf, mock_yf, yf_service, make_ticker):
         """Test search tries alternative suffixes when original fails."""
-        from src.services.yahoo_finance import YahooFinanceService
-
         # Search returns a symbol with wrong suffix
-        mock_search = MagicMock()
-        mock_search.quotes = [{"symbol": "TEST.SG", "shortname": "Test"}]
-        mock_yf.Search.return_value = mock_search
+        mock_yf.Search.return_value = SimpleNamespace(
+            quotes=[{"symbol": "TEST.SG", "shortname": "Test"}]
+        )
 
         # First call (TEST.SG) returns no price, second (TEST.DE) succeeds
         def ticker_side_effect(symbol):
-            mock = MagicMock()
             if symbol == "TEST.DE":
-                mock.info = {
-                    "quoteType": "EQUITY",
-                    "longName": "Test Stock",
-                    "currency": "EUR",
-                    "exchange": "XETRA",
-                    "regularMarketPrice": 100.00,
-                }
-            else:
-                mock.info = {}  # No price
-            return mock
+                return make_ticker(
+                    info=equity_info(
+                        longName="Test Stock",
+                        currency="EUR",
+                        exchange="XETRA",
+                        regularMarketPrice=100.0,
+                    )
+                )
+            return make_ticker(info={})  # No price
 
         mock_yf.Ticker.side_effect = ticker_side_effect
 
-        service = YahooFinanceService()
-        result = service.search_by_isin("DE1234567890")
+        result = yf_service.search_by_isin("DE1234567896")
 
         assert result is not None
         assert result.symbol == "TEST.DE"
 
-    @patch("src.services.yahoo_finance.justetf_provider")
-    @patch("src.services.yahoo_finance.yf")
-    def test_search_falls_back_to_justetf(self, mock_yf, mock_justetf):
+    def test_search_falls_back_to_justetf(self, mock_justetf, mock_yf, yf_service, make_ticker):
         """Test search falls back to justETF when all suffixes fail."""
-        from src.services.fallback_providers import TickerInfo
-        from src.services.yahoo_finance import YahooFinanceService
-
         # Search returns a symbol
-        mock_search = MagicMock()
-        mock_search.quotes = [{"symbol": "TEST.SG", "shortname": "Test"}]
-        mock_yf.Search.return_value = mock_search
+        mock_yf.Search.return_value = SimpleNamespace(
+            quotes=[{"symbol": "TEST.SG", "shortname": "Test"}]
+        )
 
         # All Yahoo symbols fail (no price)
-        mock_ticker = MagicMock()
-        mock_ticker.info = {}
-        mock_yf.Ticker.return_value = mock_ticker
+        mock_yf.Ticker.return_value = make_ticker(info={})
 
         # justETF returns valid data
         mock_justetf.search_by_isin.return_value = TickerInfo(
@@ -1334,25 +1181,19 @@ class TestYahooFinanceFallbackLogic:
             currency="GBP",
         )
 
-        service = YahooFinanceService()
-        result = service.search_by_isin("GB1234567890")
+        result = yf_service.search_by_isin("GB1234567896")
 
         assert result is not None
         # Since Yahoo has no price, returns justETF data directly
         assert result.symbol == "TEST.L"
         assert result.name == "Test ETF"
 
-    @patch("src.services.yahoo_finance.justetf_provider")
-    @patch("src.services.yahoo_finance.yf")
-    def test_justetf_fallback_verified_by_yahoo(self, mock_yf, mock_justetf):
+    def test_justetf_fallback_verified_by_yahoo(
+        self, mock_justetf, mock_yf, yf_service, make_ticker
+    ):
         """Test justETF result is verified by Yahoo Finance."""
-        from src.services.fallback_providers import TickerInfo
-        from src.services.yahoo_finance import YahooFinanceService
-
         # Empty search results
-        mock_search = MagicMock()
-        mock_search.quotes = []
-        mock_yf.Search.return_value = mock_search
+        mock_yf.Search.return_value = SimpleNamespace(quotes=[])
 
         # justETF returns valid data
         mock_justetf.search_by_isin.return_value = TickerInfo(
@@ -1363,57 +1204,41 @@ class TestYahooFinanceFallbackLogic:
         )
 
         # Yahoo confirms the symbol
-        mock_ticker = MagicMock()
-        mock_ticker.info = {
-            "quoteType": "ETF",
-            "longName": "HANetf Defence ETF",
-            "currency": "USD",
-            "exchange": "LSE",
-            "regularMarketPrice": 18.50,
-        }
-        mock_yf.Ticker.return_value = mock_ticker
-
-        service = YahooFinanceService()
-        result = service.search_by_isin("IE000OJ5TQP4")
+        mock_yf.Ticker.return_value = make_ticker(
+            info=equity_info(
+                quoteType="ETF",
+                longName="HANetf Defence ETF",
+                exchange="LSE",
+                regularMarketPrice=18.5,
+            )
+        )
+
+        result = yf_service.search_by_isin("IE000OJ5TQP4")
 
         assert result is not None
         assert result.symbol == "NATO.L"
         assert result.type == "etf"
 
-    @patch("src.services.yahoo_finance.justetf_provider")
-    @patch("src.services.yahoo_finance.yf")
-    def test_try_get_instrument_info_handles_exception(self, mock_yf, mock_justetf):
+    def test_try_get_instrument_info_handles_exception(self, mock_justetf, mock_yf, yf_service):
         """Test _try_get_instrument_info handles exceptions gracefully."""
-        from src.services.yahoo_finance import YahooFinanceService
-
-        mock_search = MagicMock()
-        mock_search.quotes = [{"symbol": "FAIL"}]
-        mock_yf.Search.return_value = mock_search
+        mock_yf.Search.return_value = SimpleNamespace(quotes=[{"symbol": "FAIL"}])
 
         # Ticker raises exception
         mock_yf.Ticker.side_effect = Exception("API error")
         mock_justetf.search_by_isin.return_value = None
 
-        service = YahooFinanceService()
-        result = service.search_by_isin("IE00BK5BQT80")
+        result = yf_service.search_by_isin("IE00BK5BQT80")
 
         # Should return None after all fallbacks fail
         assert result is None
 
-    @patch("src.services.yahoo_finance.justetf_provider")
-    @patch("src.services.yahoo_finance.yf")
-    def test_justetf_fallback_exception_handled(self, mock_yf, mock_justetf):
+    def test_justetf_fallback_exception_handled(self, mock_justetf, mock_yf, yf_service):
         """Test justETF fallback handles exceptions."""
-        from src.services.yahoo_finance import YahooFinanceService
-
-        mock_search = MagicMock()
-        mock_search.quotes = []
-        mock_yf.Search.return_value = mock_search
+        mock_yf.Search.return_value = SimpleNamespace(quotes=[])
 
         # justETF throws exception
         mock_justetf.search_by_isin.side_effect = Exception("Network error")
 
-        service = YahooFinanceService()
-        result = service.search_by_isin("IE00BK5BQT80")
+        result = yf_service.search_by_isin("IE00BK5BQT80")
 
         assert result is None
@@ -11,35 +11,43 @@ These tests:
 Requires Docker to be running.
 """
 
+import hashlib
+import os
 import time
 from collections.abc import Generator
+from pathlib import Path
 
+import docker
 import pytest
 import requests
+from docker.errors import APIError, ImageNotFound
+from requests.adapters import HTTPAdapter
 from testcontainers.core.container import DockerContainer
 from testcontainers.core.image import DockerImage
 from testcontainers.core.network import Network
 from testcontainers.core.waiting_utils import wait_for_logs
 from testcontainers.redis import RedisContainer
+from urllib3.util.retry import Retry
+
+from tests.conftest import PORTFOLIO_ISINS
+
+# Under `-n auto --dist loadgroup` all container tests share one worker, so the image,
+# Redis and app containers are built once rather than once per worker
+pytestmark = pytest.mark.xdist_group("container")
 
-# Test data: Real ISINs from user's portfolio
-TEST_ISINS = [
-    "CNE100000296",  # BYD
-    "GB00B63H8491",  # Rolls-Royce
-    "IE000OJ5TQP4",  # Future of Defence
-    "IE00BK5BQT80",  # VWRA
-    "IE00BM67HT60",  # Xtrackers MSCI World IT
-    "IE00BMW42306",  # iShares MSCI Europe SRI
-    "KYG875721634",  # Tencent
-    "KYG9830T1067",  # Xiaomi
-    "NL0009538784",  # NXP
-    "US0090661010",  # Airbnb
-    "US8740391003",  # Taiwan Semi (US ADR)
-]
 
 # Some known symbols for quote tests (obtained from search results)
 TEST_SYMBOLS = ["AAPL", "MSFT", "RR.L"]
 
+# Repository root, so the image sources resolve wherever pytest is started from
+ROOT = Path(__file__).resolve().parents[1]
+
+# Test images are tagged IMAGE_REPO:test-<source hash>
+IMAGE_REPO = "marketdataservice"
+
+# Redis database the benchmark containers use, so clearing it leaves the shared cache alone
+BENCHMARK_REDIS_DB = 1
+
 
 @pytest.fixture(scope="module")
 def docker_network() -> Generator[Network, None, None]:
@@ -58,43 +66,114 @@ def redis_container(docker_network: Network) -> Generator[RedisContainer, None,
         yield redis
 
 
+def _image_tag() -> str:
+    """Tag the test image by the hash of everything the Dockerfile copies into it."""
+    digest = hashlib.sha256()
+    sources = [ROOT / "Dockerfile", ROOT / "requirements.txt"]
+    sources += sorted(
+        path
+        for path in (ROOT / "src").rglob("*")
+        if path.is_file() and "__pycache__" not in path.parts
+    )
+    for path in sources:
+        digest.update(path.relative_to(ROOT).as_posix().encode())
+        digest.update(path.read_bytes())
+    return f"{IMAGE_REPO}:test-{digest.hexdigest()[:12]}"
+
+
+def _remove_stale_images(client: docker.DockerClient, keep: str) -> None:
+    """Delete test images built from older sources, so they don't pile up."""
+    for image in client.images.list(name=IMAGE_REPO):
+        for tag in image.tags:
+            if tag != keep and tag.startswith(f"{IMAGE_REPO}:test-"):
+                try:
+                    client.images.remove(tag)
+                except APIError:
+                    # Still used by a container (e.g. another run); leave it for next time
+                    pass
+
+
 @pytest.fixture(scope="module")
-def docker_container(
-    docker_network: Network, redis_container: RedisContainer
-) -> Generator[DockerContainer, None, None]:
-    """
-    Build and start the MarketDataService container.
-    """
+def app_image() -> str:
+    """Build the MarketDataService image, unless one for the current sources exists."""
+    tag = _image_tag()
+    client = docker.from_env()
+    try:
+        client.images.get(tag)
+        return tag
+    except ImageNotFound:
+        pass
+
     # Build the image from the project root
     image = DockerImage(
-        path=".",
-        tag="marketdataservice:test",
+        path=str(ROOT),
+        tag=tag,
     )
     image.build()
+    _remove_stale_images(client, keep=tag)
+    return tag
 
-    # Create and start container
-    container = DockerContainer(image="marketdataservice:test")
-    container.with_network(docker_network)
+
+def _start_app_container(image: str, network: Network, **env: str) -> DockerContainer:
+    """Start the service container on the test network and wait until it is serving."""
+    container = DockerContainer(image=image)
+    container.with_network(network)
     container.with_exposed_ports(8000)
     container.with_env("LOG_LEVEL", "DEBUG")  # Debug to see cache logs
     container.with_env("REDIS_HOST", "redis")
     container.with_env("REDIS_PORT", "6379")
+    for name, value in env.items():
+        container.with_env(name, value)
 
     container.start()
 
     # Wait for the application to be ready
     try:
         wait_for_logs(container, "Uvicorn running", timeout=60)
-        time.sleep(2)
+        _wait_until_healthy(container, timeout=10)
     except TimeoutError:
         container.stop()
         pytest.fail("Container failed to start within timeout")
 
+    return container
+
+
+@pytest.fixture(scope="module")
+def docker_container(
+    app_image: str, docker_network: Network, redis_container: RedisContainer
+) -> Generator[DockerContainer, None, None]:
+    """
+    Start the MarketDataService container shared by the module.
+    """
+    container = _start_app_container(app_image, docker_network)
+
     yield container
 
     container.stop()
 
 
+@pytest.fixture(scope="module")
+def base_url(docker_container: DockerContainer) -> str:
+    """Resolve the shared container's URL once instead of querying Docker in every test."""
+    return get_base_url(docker_container)
+
+
+@pytest.fixture(scope="module")
+def http() -> Generator[requests.Session, None, None]:
+    """One keep-alive session for all requests to the service under test."""
+    with requests.Session() as session:
+        # Absorb one transient gateway error from Docker's port proxy; the service's own
+        # 500s are never retried, and POSTs are not retried (urllib3's default)
+        session.mount(
+            "http://",
+            HTTPAdapter(
+                pool_maxsize=4,
+                max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504]),
+            ),
+        )
+        yield session
+
+
 def get_base_url(container: DockerContainer) -> str:
     """Get the base URL for the running container."""
     host = container.get_container_host_ip()
@@ -102,15 +181,28 @@ def get_base_url(container: DockerContainer) -> str:
     return f"http://{host}:{port}"
 
 
+def _wait_until_healthy(container: DockerContainer, timeout: float) -> None:
+    """Poll /health until it answers 200, instead of sleeping a fixed warm-up period."""
+    url = f"{get_base_url(container)}/health"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(url, timeout=0.5).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"{url} did not become healthy within {timeout}s")
+
+
 @pytest.mark.container
 class TestContainerHealthEndpoints:
     """Tests for health and root endpoints using real container."""
 
-    def test_health_endpoint(self, docker_container: DockerContainer):
+    def test_health_endpoint(self, base_url: str, http: requests.Session):
         """Test /health returns healthy status."""
-        base_url = get_base_url(docker_container)
 
-        response = requests.get(f"{base_url}/health", timeout=10)
+        response = http.get(f"{base_url}/health", timeout=10)
 
         assert response.status_code == 200
         data = response.json()
@@ -122,26 +214,25 @@ class TestContainerHealthEndpoints:
 class TestContainerMetadataCaching:
     """Tests specifically for Redis caching behavior."""
 
-    def test_metadata_caching_performance(self, docker_container: DockerContainer):
+    def test_metadata_caching_performance(self, base_url: str, http: requests.Session):
         """
         Verify that the second request for the same ISIN is significantly faster
         due to Redis caching.
         """
-        base_url = get_base_url(docker_container)
         isin = "IE00BK5BQT80"  # VWRA
 
         # First request: Fresh search (will hit Yahoo/JustETF and cache it)
-        start_first = time.time()
-        res1 = requests.get(f"{base_url}/api/v1/search/{isin}", timeout=40)
-        duration_first = time.time() - start_first
+        start_first = time.perf_counter()
+        res1 = http.get(f"{base_url}/api/v1/search/{isin}", timeout=40)
+        duration_first = time.perf_counter() - start_first
 
         assert res1.status_code == 200
         print(f"\n  First search (uncached): {duration_first:.2f}s")
 
         # Second request: Should be a cache hit
-        start_second = time.time()
-        res2 = requests.get(f"{base_url}/api/v1/search/{isin}", timeout=10)
-        duration_second = time.time() - start_second
+        start_second = time.perf_counter()
+        res2 = http.get(f"{base_url}/api/v1/search/{isin}", timeout=10)
+        duration_second = time.perf_counter() - start_second
 
         print(f"  Second search (cached):   {duration_second:.4f}s")
         print(f"  >>> Speedup: {duration_first / duration_second:.1f}x faster!")
@@ -160,12 +251,11 @@ class TestContainerMetadataCaching:
 class TestContainerSearchEndpoints:
     """Tests for search endpoints using real container with real Yahoo Finance calls."""
 
-    def test_search_single_isin_success(self, docker_container: DockerContainer):
+    def test_search_single_isin_success(self, base_url: str, http: requests.Session):
         """Test GET /api/v1/search/{isin} with a valid ISIN."""
-        base_url = get_base_url(docker_container)
         isin = "US0090661010"  # Airbnb
 
-        response = requests.get(f"{base_url}/api/v1/search/{isin}", timeout=30)
+        response = http.get(f"{base_url}/api/v1/search/{isin}", timeout=30)
 
         assert response.status_code == 200
         data = response.json()
@@ -173,28 +263,26 @@ class TestContainerSearchEndpoints:
         assert "symbol" in data
         print(f"\n  Found: {data['symbol']} - {data['name']}")
 
-    def test_search_single_isin_not_found_handling(self, docker_container: DockerContainer):
+    def test_search_single_isin_not_found_handling(self, base_url: str, http: requests.Session):
         """Test GET /api/v1/search/{isin} with a clearly invalid ISIN."""
-        base_url = get_base_url(docker_container)
         isin = "INVALID_FORMAT"  # Fails regex validation
 
-        response = requests.get(f"{base_url}/api/v1/search/{isin}", timeout=30)
+        response = http.get(f"{base_url}/api/v1/search/{isin}", timeout=30)
 
         # Should be 404 due to strict format validation
         assert response.status_code == 404
 
-    def test_search_batch_all_portfolio_isins(self, docker_container: DockerContainer):
+    def test_search_batch_all_portfolio_isins(self, base_url: str, http: requests.Session):
         """Test POST /api/v1/search/batch with all portfolio ISINs."""
-        base_url = get_base_url(docker_container)
-        payload = {"isins": TEST_ISINS}
+        payload = {"isins": PORTFOLIO_ISINS}
 
-        start_time = time.time()
-        response = requests.post(
+        start_time = time.perf_counter()
+        response = http.post(
             f"{base_url}/api/v1/search/batch",
             json=payload,
             timeout=120,
         )
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
 
         print(f"\n  Batch search duration: {duration:.2f}s")
 
@@ -202,24 +290,66 @@ class TestContainerSearchEndpoints:
         data = response.json()
 
         results = data.get("results", [])
-        print(f"  Successful: {len(results)}/{len(TEST_ISINS)}")
+        print(f"  Successful: {len(results)}/{len(PORTFOLIO_ISINS)}")
 
         # Verify each result has required fields
         for result in results:
             assert "isin" in result
             assert "symbol" in result
 
+    @pytest.mark.benchmark
+    @pytest.mark.skipif(
+        os.getenv("RUN_BENCHMARKS") != "1", reason="timing sweep, set RUN_BENCHMARKS=1 to run"
+    )
+    @pytest.mark.parametrize("concurrency", [1, 4, 8, 16, 32])
+    def test_batch_concurrency_sweep(
+        self,
+        concurrency: int,
+        app_image: str,
+        docker_network: Network,
+        redis_container: RedisContainer,
+        http: requests.Session,
+        record_property,
+    ):
+        """Time the portfolio batch search at several BATCH_CONCURRENCY settings."""
+        # Start every run cold, otherwise later runs are served from the response cache
+        redis_container.get_client(db=BENCHMARK_REDIS_DB).flushdb()
+        container = _start_app_container(
+            app_image,
+            docker_network,
+            REDIS_DB=str(BENCHMARK_REDIS_DB),
+            BATCH_CONCURRENCY=str(concurrency),
+            # Keep the executor from capping the semaphore being measured
+            YFINANCE_MAX_WORKERS=str(max(concurrency, 16)),
+        )
+        try:
+            start_time = time.perf_counter()
+            response = http.post(
+                f"{get_base_url(container)}/api/v1/search/batch",
+                json={"isins": PORTFOLIO_ISINS},
+                timeout=120,
+            )
+            duration = time.perf_counter() - start_time
+        finally:
+            container.stop()
+
+        assert response.status_code == 200
+        found = len(response.json()["results"])
+        record_property(f"batch_search_seconds_c{concurrency}", round(duration, 2))
+        print(
+            f"\n  concurrency={concurrency}: {duration:.2f}s ({found}/{len(PORTFOLIO_ISINS)} found)"
+        )
+
 
 @pytest.mark.container
 class TestContainerQuoteEndpoints:
     """Tests for quote endpoints using real container with real Yahoo Finance calls."""
 
-    def test_quote_single_symbol_success(self, docker_container: DockerContainer):
+    def test_quote_single_symbol_success(self, base_url: str, http: requests.Session):
         """Test GET /api/v1/quote/{symbol} with a valid symbol."""
-        base_url = get_base_url(docker_container)
         symbol = "AAPL"
 
-        response = requests.get(f"{base_url}/api/v1/quote/{symbol}", timeout=30)
+        response = http.get(f"{base_url}/api/v1/quote/{symbol}", timeout=30)
 
         assert response.status_code == 200
         data = response.json()
@@ -232,17 +362,16 @@ class TestContainerQuoteEndpoints:
 class TestContainerEndToEndWorkflow:
     """End-to-end workflow tests."""
 
-    def test_search_then_quote_workflow(self, docker_container: DockerContainer):
-        base_url = get_base_url(docker_container)
+    def test_search_then_quote_workflow(self, base_url: str, http: requests.Session):
         isin = "US8740391003"  # Taiwan Semi
 
         # Step 1: Search
-        search_res = requests.get(f"{base_url}/api/v1/search/{isin}", timeout=30)
+        search_res = http.get(f"{base_url}/api/v1/search/{isin}", timeout=30)
         assert search_res.status_code == 200
         symbol = search_res.json()["symbol"]
 
         # Step 2: Quote
-        quote_res = requests.get(f"{base_url}/api/v1/quote/{symbol}", timeout=30)
+        quote_res = http.get(f"{base_url}/api/v1/quote/{symbol}", timeout=30)
         assert quote_res.status_code == 200
         assert float(quote_res.json()["price"]) > 0
 
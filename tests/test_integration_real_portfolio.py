@@ -1,26 +1,8 @@
 import time
 
 import pytest
-from fastapi.testclient import TestClient
 
-from src.main import app
-
-client = TestClient(app)
-
-# Real ISINs from the user's portfolio
-PORTFOLIO_ISINS = [
-    "CNE100000296",  # BYD
-    "GB00B63H8491",  # Rolls-Royce
-    "IE000OJ5TQP4",  # Future of Defence (Tricky one!)
-    "IE00BK5BQT80",  # VWRA
-    "IE00BM67HT60",  # Xtrackers MSCI World IT
-    "IE00BMW42306",  # iShares MSCI Europe SRI
-    "KYG875721634",  # Tencent
-    "KYG9830T1067",  # Xiaomi
-    "NL0009538784",  # NXP
-    "US0090661010",  # Airbnb
-    "US8740391003",  # Taiwan Semi (US ADR)
-]
+from tests.conftest import PORTFOLIO_ISINS
 
 
 @pytest.mark.integration
@@ -30,7 +12,7 @@ class TestRealPortfolioIntegration:
     These tests verify the actual end-to-end performance and logic with live data.
     """
 
-    def test_batch_search_performance_and_accuracy(self):
+    def test_batch_search_performance_and_accuracy(self, client):
         """
         Verify that searching for the user's specific portfolio is:
         1. Fast (< 15 seconds to be safe, ideally < 10s)
@@ -39,9 +21,9 @@ class TestRealPortfolioIntegration:
         """
         payload = {"isins": PORTFOLIO_ISINS}
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         response = client.post("/api/v1/search/batch", json=payload)
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
 
         print(f"\nBatch Search Duration: {duration:.2f} seconds")
 
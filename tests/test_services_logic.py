@@ -3,33 +3,51 @@ Unit tests for internal service logic, including ISIN validation,
 caching, and circuit breaker mechanisms.
 """
 
+import asyncio
+import threading
+import time
 from datetime import UTC, datetime, timedelta
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-import responses
-from bs4 import BeautifulSoup
-from fakeredis import FakeRedis
+from fakeredis import FakeAsyncRedis, FakeRedis, FakeServer
+from lxml.html import document_fromstring
 
-from src.services.fallback_providers import JustETFProvider, MetadataCache, TickerInfo
+import responses
+from src.models.schemas import QuoteResponse
+from src.services.fallback_providers import (
+    JustETFProvider,
+    MetadataCache,
+    ProviderUnavailableError,
+    QuoteCache,
+    TickerInfo,
+)
 from src.services.yahoo_finance import is_valid_isin, yahoo_finance_service
 
 
 class TestISINValidation:
     """Tests for ISIN validation logic."""
 
-    def test_valid_isins(self):
-        assert is_valid_isin("US0378331005") is True  # Apple
-        assert is_valid_isin("IE00BK5BQT80") is True  # VWRA
-        assert is_valid_isin("DE0007164600") is True  # SAP
-        assert is_valid_isin("cne100000296") is True  # Mixed case
-
-    def test_invalid_isins(self):
-        assert is_valid_isin("INVALID") is False
-        assert is_valid_isin("US123456789") is False  # Too short
-        assert is_valid_isin("US123456789012") is False  # Too long
-        assert is_valid_isin("") is False
-        assert is_valid_isin(None) is False
+    @pytest.mark.parametrize(
+        ("isin", "expected"),
+        [
+            ("US0378331005", True),  # Apple
+            ("IE00BK5BQT80", True),  # VWRA
+            ("DE0007164600", True),  # SAP
+            ("cne100000296", True),  # Mixed case
+            ("INVALID", False),
+            ("US123456789", False),  # Too short
+            ("US123456789012", False),  # Too long
+            ("US0378331006", False),  # Bad check digit
+            ("IE00BK5BQT81", False),  # Bad check digit
+            ("US0378331005\n", False),  # Trailing newline
+            ("US594918104\uff15", False),  # Full-width check digit
+            ("", False),
+            (None, False),
+        ],
+    )
+    def test_is_valid_isin(self, isin, expected):
+        assert is_valid_isin(isin) is expected
 
 
 class TestMetadataCache:
@@ -38,7 +56,10 @@ class TestMetadataCache:
     @pytest.fixture
     def mock_cache(self):
         cache = MetadataCache()
-        cache.redis = FakeRedis(decode_responses=True)
+        # Sync and async clients see the same data, as with a real server
+        server = FakeServer()
+        cache.redis = FakeRedis(server=server, decode_responses=True)
+        cache.async_redis = FakeAsyncRedis(server=server, decode_responses=True)
         cache.enabled = True
         return cache
 
@@ -50,9 +71,106 @@ class TestMetadataCache:
         assert cached == info
         assert cached.symbol == "AAPL"
 
+    def test_get_reads_existing_json_entries(self, mock_cache):
+        # Entries written before the msgspec switch use the same JSON layout
+        mock_cache.redis.set(
+            "metadata:IE00BK5BQT80",
+            '{"symbol": "VWRA.L", "name": "VWRA", "exchange": "LSE", "currency": "USD"}',
+        )
+
+        cached = mock_cache.get("IE00BK5BQT80")
+        assert cached == TickerInfo(symbol="VWRA.L", name="VWRA", exchange="LSE", currency="USD")
+
+    async def test_mget_returns_only_cached_entries(self, mock_cache):
+        info = TickerInfo(symbol="VWRA.L", name="VWRA", exchange="LSE", currency="USD")
+        mock_cache.set("IE00BK5BQT80", info)
+
+        cached = await mock_cache.mget(["IE00BK5BQT80", "US0378331005"])
+        assert cached == {"IE00BK5BQT80": info}
+
+    async def test_mget_disabled_or_failing(self, mock_cache):
+        assert await mock_cache.mget([]) == {}
+        mock_cache.async_redis.mget = AsyncMock(side_effect=Exception("Redis error"))
+        assert await mock_cache.mget(["IE00BK5BQT80"]) == {}
+        mock_cache.enabled = False
+        assert await mock_cache.mget(["IE00BK5BQT80"]) == {}
+
+    async def test_set_and_get_response(self, mock_cache):
+        from src.models.schemas import InstrumentResponse
+
+        instrument = InstrumentResponse(
+            isin="US0378331005",
+            symbol="AAPL",
+            name="Apple Inc.",
+            type="stock",
+            currency="USD",
+            exchange="NASDAQ",
+        )
+        await mock_cache.set_response("US0378331005", instrument)
+
+        assert await mock_cache.get_response("US0378331005") == instrument.model_dump_json()
+        assert mock_cache.redis.ttl("metadata:json:US0378331005") > 0
+
+    async def test_response_cache_disabled_or_failing(self, mock_cache):
+        mock_cache.async_redis.get = AsyncMock(side_effect=Exception("Redis error"))
+        mock_cache.async_redis.setex = AsyncMock(side_effect=Exception("Redis error"))
+        assert await mock_cache.get_response("US0378331005") is None
+        await mock_cache.set_response("US0378331005", MagicMock())
+
+        mock_cache.enabled = False
+        assert await mock_cache.get_response("US0378331005") is None
+        await mock_cache.set_response("US0378331005", MagicMock())
+        mock_cache.async_redis.setex.assert_awaited_once()
+
+    async def test_set_and_mget_responses(self, mock_cache):
+        from src.models.schemas import InstrumentResponse
+
+        instrument = InstrumentResponse(
+            isin="US0378331005",
+            symbol="AAPL",
+            name="Apple Inc.",
+            type="stock",
+            currency="USD",
+            exchange="NASDAQ",
+        )
+        await mock_cache.set_responses({"US0378331005": instrument})
+
+        cached = await mock_cache.mget_responses(["US0378331005", "IE00BK5BQT80"])
+        assert cached == {"US0378331005": instrument.model_dump_json()}
+        assert mock_cache.redis.ttl("metadata:json:US0378331005") > 0
+
+    async def test_response_batch_disabled_or_failing(self, mock_cache):
+        mock_cache.async_redis.mget = AsyncMock(side_effect=Exception("Redis error"))
+        mock_cache.async_redis.pipeline = MagicMock(side_effect=Exception("Redis error"))
+        assert await mock_cache.mget_responses(["US0378331005"]) == {}
+        await mock_cache.set_responses({"US0378331005": MagicMock()})
+
+        mock_cache.enabled = False
+        assert await mock_cache.mget_responses(["US0378331005"]) == {}
+        await mock_cache.set_responses({"US0378331005": MagicMock()})
+        mock_cache.async_redis.pipeline.assert_called_once()
+
     def test_get_non_existent(self, mock_cache):
         assert mock_cache.get("NONEXISTENT") is None
 
+    def test_get_served_from_local_cache(self, mock_cache):
+        info = TickerInfo(symbol="AAPL", name="Apple Inc.", exchange="NASDAQ", currency="USD")
+        mock_cache.set("US0378331005", info)
+        assert mock_cache.get("US0378331005") == info
+
+        # Hot entries no longer need Redis
+        mock_cache.redis.delete("metadata:US0378331005")
+        assert mock_cache.get("US0378331005") == info
+
+    def test_set_invalidates_local_cache(self, mock_cache):
+        old = TickerInfo(symbol="OLD", name="Old", exchange="XETRA", currency="EUR")
+        new = TickerInfo(symbol="NEW", name="New", exchange="XETRA", currency="EUR")
+        mock_cache.set("IE00BK5BQT80", old)
+        assert mock_cache.get("IE00BK5BQT80") == old
+
+        mock_cache.set("IE00BK5BQT80", new)
+        assert mock_cache.get("IE00BK5BQT80") == new
+
     def test_cache_disabled(self, mock_cache):
         mock_cache.enabled = False
         info = TickerInfo(symbol="A", name="B", exchange="C", currency="D")
@@ -81,6 +199,10 @@ class TestMetadataCache:
         cache = MetadataCache()
         assert cache.enabled is True
         assert cache.redis is not None
+        assert cache.async_redis is not None
+        pool = mock_redis_class.call_args.kwargs["connection_pool"]
+        assert pool.max_connections == 32
+        assert pool.connection_kwargs["socket_keepalive"] is True
 
     @patch("src.services.fallback_providers.redis.Redis")
     def test_cache_init_failure(self, mock_redis_class):
@@ -89,6 +211,104 @@ class TestMetadataCache:
         cache = MetadataCache()
         assert cache.enabled is False
         assert cache.redis is None
+        assert cache.async_redis is None
+
+
+def quote_fetched(seconds_ago: int) -> QuoteResponse:
+    """A quote whose timestamp lies the given number of seconds in the past."""
+    fetched = datetime.now(UTC) - timedelta(seconds=seconds_ago)
+    return QuoteResponse(symbol="AAPL", price="195.5000", currency="USD", time=fetched.isoformat())
+
+
+class TestQuoteCache:
+    """Tests for the short-lived Redis quote cache."""
+
+    @pytest.fixture
+    def quote_cache(self):
+        return QuoteCache(FakeAsyncRedis(decode_responses=True))
+
+    @pytest.fixture
+    def quote(self):
+        """A quote fetched just now."""
+        return quote_fetched(seconds_ago=0)
+
+    async def test_set_and_get_quote(self, quote_cache, quote):
+        await quote_cache.set("AAPL", quote)
+
+        assert await quote_cache.get("AAPL") == quote.model_dump_json()
+        assert await quote_cache.redis.ttl("quote:AAPL") > 0
+
+    async def test_stale_quote_outlives_fresh_entry(self, quote_cache, quote):
+        await quote_cache.set("AAPL", quote)
+
+        assert await quote_cache.redis.ttl("quote:stale:AAPL") > await quote_cache.redis.ttl(
+            "quote:AAPL"
+        )
+        await quote_cache.redis.delete("quote:AAPL")
+        assert await quote_cache.get_stale("AAPL") == quote.model_dump_json()
+
+    async def test_hot_quote_served_locally_until_overwritten(self, quote_cache, quote):
+        await quote_cache.set("AAPL", quote)
+        assert await quote_cache.get("AAPL") == quote.model_dump_json()
+
+        await quote_cache.redis.delete("quote:AAPL")
+        assert await quote_cache.get("AAPL") == quote.model_dump_json()
+
+        await quote_cache.set("AAPL", quote)
+        await quote_cache.redis.delete("quote:AAPL")
+        assert await quote_cache.get("AAPL") is None
+
+    async def test_aged_quote_keeps_its_original_expiry(self, quote_cache):
+        await quote_cache.set("AAPL", quote_fetched(seconds_ago=50))
+        assert 0 < await quote_cache.redis.ttl("quote:AAPL") <= 10
+
+        # Already past its fresh window: only the stale copy is kept
+        expired = quote_fetched(seconds_ago=120)
+        await quote_cache.set_many({"MSFT": expired})
+        assert await quote_cache.mget(["MSFT"]) == {}
+        assert await quote_cache.get_stale("MSFT") == expired.model_dump_json()
+
+    async def test_local_copy_expires_with_redis_key(self, quote_cache, quote):
+        await quote_cache.redis.set("quote:AAPL", quote.model_dump_json(), px=50)
+        await quote_cache.redis.set("quote:MSFT", quote.model_dump_json(), px=50)
+        assert await quote_cache.get("AAPL") == quote.model_dump_json()
+        assert await quote_cache.mget(["MSFT"]) == {"MSFT": quote.model_dump_json()}
+
+        await asyncio.sleep(0.1)
+        assert await quote_cache.get("AAPL") is None
+        assert await quote_cache.mget(["MSFT"]) == {}
+
+    async def test_set_many_and_mget(self, quote_cache, quote):
+        await quote_cache.set_many({"AAPL": quote})
+
+        assert await quote_cache.mget(["AAPL", "MSFT"]) == {"AAPL": quote.model_dump_json()}
+        assert await quote_cache.get_stale("AAPL") == quote.model_dump_json()
+
+        # Served from the local layer once fetched
+        await quote_cache.redis.delete("quote:AAPL")
+        assert await quote_cache.mget(["AAPL"]) == {"AAPL": quote.model_dump_json()}
+
+    async def test_get_missing_quote(self, quote_cache):
+        assert await quote_cache.get("MISSING") is None
+
+    async def test_quote_cache_disabled_without_client(self):
+        cache = QuoteCache()
+        assert cache.enabled is False
+        await cache.set("AAPL", MagicMock())
+        assert await cache.get("AAPL") is None
+        assert await cache.get_stale("AAPL") is None
+
+    async def test_quote_cache_errors_are_swallowed(self, quote_cache):
+        quote_cache.redis.get = AsyncMock(side_effect=Exception("Redis error"))
+        quote_cache.redis.pipeline = MagicMock(side_effect=Exception("Redis error"))
+
+        assert await quote_cache.get("AAPL") is None
+        assert await quote_cache.get_stale("AAPL") is None
+        await quote_cache.set("AAPL", MagicMock())
+
+        quote_cache.redis.mget = AsyncMock(side_effect=Exception("Redis error"))
+        assert await quote_cache.mget(["AAPL"]) == {}
+        await quote_cache.set_many({"AAPL": MagicMock()})
 
 
 class TestJustETFProviderResilience:
@@ -99,18 +319,23 @@ class TestJustETFProviderResilience:
         with patch("src.services.fallback_providers.metadata_cache.enabled", False):
             return JustETFProvider()
 
+    def test_session_pool_sized_for_workers(self, provider):
+        adapter = provider.session.get_adapter("https://www.justetf.com")
+        assert adapter._pool_maxsize == 16
+        assert 403 not in adapter.max_retries.status_forcelist
+
     def test_circuit_breaker_trips_on_403(self, provider):
         with responses.RequestsMock() as rsps:
             rsps.add(responses.GET, provider.BASE_URL, status=403)
 
             # First call should trip it
-            result = provider.search_by_isin("IE00BK5BQT80")
-            assert result is None
+            with pytest.raises(ProviderUnavailableError):
+                provider.search_by_isin("IE00BK5BQT80")
             assert provider._is_blocked() is True
 
             # Subsequent calls should be blocked immediately
-            result2 = provider.search_by_isin("IE00BK5BQT80")
-            assert result2 is None
+            with pytest.raises(ProviderUnavailableError):
+                provider.search_by_isin("IE00BK5BQT80")
             assert len(rsps.calls) == 1  # Only one request made
 
     def test_circuit_breaker_expiration(self, provider):
@@ -122,8 +347,8 @@ class TestJustETFProviderResilience:
     @responses.activate
     def test_handle_scraper_error(self, provider):
         responses.add(responses.GET, provider.BASE_URL, status=500)
-        result = provider.search_by_isin("IE00BK5BQT80")
-        assert result is None
+        with pytest.raises(ProviderUnavailableError):
+            provider.search_by_isin("IE00BK5BQT80")
 
     def test_search_by_isin_cache_hit(self, provider):
         from src.services.fallback_providers import TickerInfo
@@ -137,76 +362,80 @@ class TestJustETFProviderResilience:
 
     @responses.activate
     def test_search_by_isin_generic_exception(self, provider):
-        # Trigger an exception inside the try block (e.g., BeautifulSoup failing)
+        # Trigger an exception inside the try block (e.g., the HTML parser failing)
         responses.add(responses.GET, provider.BASE_URL, body="<html><body>")
         with patch(
-            "src.services.fallback_providers.BeautifulSoup", side_effect=Exception("Parsing error")
+            "src.services.fallback_providers.document_fromstring",
+            side_effect=Exception("Parsing error"),
         ):
-            result = provider.search_by_isin("IE00BK5BQT80")
-            assert result is None
+            with pytest.raises(ProviderUnavailableError):
+                provider.search_by_isin("IE00BK5BQT80")
 
 
 class TestJustETFParsing:
     """Tests for the HTML parsing logic of JustETFProvider."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def provider(self):
+        # The extractors are stateless, so one provider serves every case
         return JustETFProvider()
 
-    def test_extract_ticker(self, provider):
-        html = '<div data-ticker="VWRA"></div>'
-        soup = BeautifulSoup(html, "html.parser")
-        assert provider._extract_ticker(soup, html) == "VWRA"
-
-        html2 = "<span>Ticker: NATO</span>"
-        soup2 = BeautifulSoup(html2, "html.parser")
-        assert provider._extract_ticker(soup2, html2) == "NATO"
-
-    def test_extract_name(self, provider):
-        html = "<h1>Vanguard FTSE All-World</h1>"
-        soup = BeautifulSoup(html, "html.parser")
-        assert provider._extract_name(soup) == "Vanguard FTSE All-World"
-
-        html2 = "<title>iShares Core MSCI World | justETF</title>"
-        soup2 = BeautifulSoup(html2, "html.parser")
-        assert provider._extract_name(soup2) == "iShares Core MSCI World"
-
-    def test_extract_exchange(self, provider):
-        # Test XETRA detection
-        html = "<div>Trading on XETRA exchange</div>"
-        soup = BeautifulSoup(html, "html.parser")
-        name, suffix = provider._extract_exchange(soup)
-        assert name == "XETRA"
-        assert suffix == ".DE"
-
-        # Test London fallback
-        html2 = "<div>No specific exchange mentioned</div>"
-        soup2 = BeautifulSoup(html2, "html.parser")
-        name2, suffix2 = provider._extract_exchange(soup2)
-        assert name2 is None
-        assert suffix2 == ".L"
-
-    def test_extract_currency(self, provider):
-        html = "<div>The currency is USD</div>"
-        soup = BeautifulSoup(html, "html.parser")
-        assert provider._extract_currency(soup) == "USD"
-
-        html2 = "<div>Trading in EUR</div>"
-        soup2 = BeautifulSoup(html2, "html.parser")
-        assert provider._extract_currency(soup2) == "EUR"
-
-        html3 = "<div>No currency here</div>"
-        soup3 = BeautifulSoup(html3, "html.parser")
-        assert provider._extract_currency(soup3) is None
-
-    def test_extract_ticker_none(self, provider):
-        assert provider._extract_ticker(BeautifulSoup("", "html.parser"), "") is None
-
-    def test_extract_name_none(self, provider):
-        assert (
-            provider._extract_name(BeautifulSoup("<html><body></body></html>", "html.parser"))
-            is None
+    @pytest.mark.parametrize(
+        ("html", "expected"),
+        [
+            ('<div data-ticker="VWRA"></div>', "VWRA"),
+            ("<span>Ticker: NATO</span>", "NATO"),
+            ("<html></html>", None),
+        ],
+    )
+    def test_extract_ticker(self, provider, html, expected):
+        assert provider._extract_ticker(document_fromstring(html), html) == expected
+
+    @pytest.mark.parametrize(
+        ("html", "expected"),
+        [
+            ("<h1>Vanguard FTSE All-World</h1>", "Vanguard FTSE All-World"),
+            ("<title>iShares Core MSCI World | justETF</title>", "iShares Core MSCI World"),
+            ("<html><body></body></html>", None),
+        ],
+    )
+    def test_extract_name(self, provider, html, expected):
+        assert provider._extract_name(document_fromstring(html)) == expected
+
+    @pytest.mark.parametrize(
+        ("html", "expected"),
+        [
+            ("<div>Trading on XETRA exchange</div>", ("XETRA", ".DE")),
+            # London fallback
+            ("<div>No specific exchange mentioned</div>", (None, ".L")),
+            # Several exchanges listed: the first in EXCHANGE_TO_SUFFIX order wins
+            ("<div>London Stock Exchange</div><div>XETRA</div>", ("XETRA", ".DE")),
+        ],
+    )
+    def test_extract_exchange(self, provider, html, expected):
+        assert provider._extract_exchange(document_fromstring(html)) == expected
+
+    def test_script_text_is_ignored(self, provider):
+        # Page data blobs in <head> mention other venues and currencies than the listing
+        html = (
+            '<html><head><script>{"venues": ["XETRA"], "ccy": "USD"}</script>'
+            "<style>.EUR {}</style></head>"
+            "<body><div>Listed on London Stock Exchange</div><span>Currency GBP</span></body></html>"
         )
+        tree = document_fromstring(html)
+        assert provider._extract_exchange(tree) == ("London Stock Exchange", ".L")
+        assert provider._extract_currency(tree) == "GBP"
+
+    @pytest.mark.parametrize(
+        ("html", "expected"),
+        [
+            ("<div>The currency is USD</div>", "USD"),
+            ("<div>Trading in EUR</div>", "EUR"),
+            ("<div>No currency here</div>", None),
+        ],
+    )
+    def test_extract_currency(self, provider, html, expected):
+        assert provider._extract_currency(document_fromstring(html)) == expected
 
 
 class TestYahooFinanceServiceExtensions:
@@ -225,12 +454,18 @@ class TestYahooFinanceServiceExtensions:
 
         yahoo_finance_service.search_by_isin(isin)
 
-        mock_fallback.assert_called_once_with(isin)
+        mock_fallback.assert_called_once_with(isin, None, remember_miss=True)
 
     @patch("src.services.yahoo_finance.justetf_provider.search_by_isin")
     @patch("src.services.yahoo_finance.yahoo_finance_service._try_get_instrument_info")
     @patch("src.services.yahoo_finance.yahoo_finance_service._try_search_by_name_fallback")
-    def test_justetf_fallback_final_name_resort(self, mock_name_search, mock_info, mock_justetf):
+    @patch(
+        "src.services.yahoo_finance.yahoo_finance_service._fetch_quote_records",
+        side_effect=Exception("offline"),
+    )
+    def test_justetf_fallback_final_name_resort(
+        self, mock_records, mock_name_search, mock_info, mock_justetf
+    ):
         # Simulate justETF found something but Yahoo info failed
         mock_justetf.return_value = TickerInfo(
             symbol="TEST", name="Test Name", exchange="Ex", currency="USD"
@@ -242,3 +477,202 @@ class TestYahooFinanceServiceExtensions:
 
         # Should have tried name search as last resort
         mock_name_search.assert_called_once_with(isin, "Test Name")
+
+    @patch("src.services.yahoo_finance.justetf_provider.search_by_isin")
+    @patch("src.services.yahoo_finance.yf.Search")
+    async def test_batch_search_uses_prefetched_metadata(
+        self, mock_yf_search, mock_justetf, mock_metadata_cache
+    ):
+        mock_yf_search.return_value.quotes = []
+        info = TickerInfo(symbol="VWRA.L", name="VWRA", exchange="LSE", currency="USD")
+        mock_metadata_cache.mget.return_value = {"IE00BK5BQT80": info}
+
+        with (
+            patch.object(yahoo_finance_service, "_try_get_instrument_info", return_value=None),
+            patch.object(yahoo_finance_service, "_try_search_by_name_fallback", return_value=None),
+        ):
+            results, errors = await yahoo_finance_service.batch_search_by_isins(["IE00BK5BQT80"])
+
+        mock_metadata_cache.mget.assert_called_once_with(["IE00BK5BQT80"])
+        mock_justetf.assert_not_called()
+        assert results[0].symbol == "VWRA.L"
+        assert errors == []
+
+    @patch("src.services.yahoo_finance.yf.Search")
+    async def test_batch_search_serves_cached_responses(self, mock_yf_search, mock_metadata_cache):
+        from src.models.schemas import InstrumentResponse
+
+        cached = InstrumentResponse(
+            isin="US0378331005",
+            symbol="AAPL",
+            name="Apple Inc.",
+            type="stock",
+            currency="USD",
+            exchange="NASDAQ",
+        )
+        mock_metadata_cache.mget_responses.return_value = {"US0378331005": cached.model_dump_json()}
+        fetched = cached.model_copy(update={"isin": "US5949181045", "symbol": "MSFT"})
+
+        with patch.object(yahoo_finance_service, "search_by_isin", return_value=fetched) as search:
+            results, errors = await yahoo_finance_service.batch_search_by_isins(
+                ["US0378331005", "US5949181045"]
+            )
+
+        search.assert_called_once_with("US5949181045", None)
+        mock_metadata_cache.mget.assert_called_once_with(["US5949181045"])
+        mock_metadata_cache.set_responses.assert_awaited_once_with({"US5949181045": fetched})
+        assert results == [cached, fetched]
+        assert errors == []
+
+    async def test_batch_quotes_serve_cached_quotes(self, mock_quote_cache):
+        cached = QuoteResponse(
+            symbol="AAPL", price="195.5000", currency="USD", time="2024-12-24T15:00:00+00:00"
+        )
+        fetched = cached.model_copy(update={"symbol": "MSFT"})
+        mock_quote_cache.mget.return_value = {"AAPL": cached.model_dump_json()}
+
+        with (
+            patch.object(yahoo_finance_service, "get_quote", return_value=fetched) as get_quote,
+            patch.object(yahoo_finance_service, "_fetch_quote_records", return_value=[]),
+        ):
+            results, errors = await yahoo_finance_service.batch_get_quotes(["AAPL", "MSFT"])
+
+        get_quote.assert_called_once_with("MSFT")
+        mock_quote_cache.set_many.assert_awaited_once_with({"MSFT": fetched})
+        assert results == [cached, fetched]
+        assert errors == []
+
+    async def test_batch_quotes_respect_concurrency_limit(self):
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_quote(symbol):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            return None
+
+        with (
+            patch.object(yahoo_finance_service, "get_quote", side_effect=slow_quote),
+            patch.object(yahoo_finance_service, "_fetch_quote_records", return_value=[]),
+            patch("src.services.yahoo_finance.get_settings") as mock_settings,
+        ):
+            mock_settings.return_value.batch_concurrency = 2
+            _, errors = await yahoo_finance_service.batch_get_quotes([f"S{i}" for i in range(8)])
+
+        assert len(errors) == 8
+        assert peak <= 2
+
+    async def test_batch_quotes_deduplicate_symbols(self):
+        quote = QuoteResponse(
+            symbol="AAPL", price="195.5000", currency="USD", time="2024-12-24T15:00:00+00:00"
+        )
+
+        with (
+            patch.object(yahoo_finance_service, "get_quote", return_value=quote) as mock_quote,
+            patch.object(yahoo_finance_service, "_fetch_quote_records", return_value=[]),
+        ):
+            results, errors = await yahoo_finance_service.batch_get_quotes(["AAPL", "MSFT", "AAPL"])
+
+        assert mock_quote.call_count == 2
+        assert len(results) == 3
+        assert errors == []
+
+    def test_collect_outcomes_turns_exceptions_into_errors(self):
+        outcomes = yahoo_finance_service._collect_outcomes(
+            ["AAPL", "FAIL"], [("AAPL", "quote", None), RuntimeError("boom")]
+        )
+
+        assert outcomes == {"AAPL": ("quote", None), "FAIL": (None, "boom")}
+
+    def test_quote_chunk_formats_numeric_string_prices(self, yf_service):
+        # _is_valid_price accepts numeric strings, so formatting must too
+        records = [{"symbol": "AAPL", "regularMarketPrice": "195.5", "currency": "USD"}]
+
+        with patch.object(yf_service, "_fetch_quote_records", return_value=records):
+            found = yf_service._fetch_quote_chunk(["AAPL"])
+
+        assert found["AAPL"].price == "195.5000"
+
+    async def test_batch_quotes_use_bulk_quote_endpoint(self):
+        records = [
+            {"symbol": "AAPL", "regularMarketPrice": 195.5, "currency": "USD"},
+            {"symbol": "VWRA.L", "regularMarketPrice": 120.25, "currency": "USD"},
+            {"symbol": "GHOST", "regularMarketPrice": 0},
+        ]
+        fallback = QuoteResponse(
+            symbol="GHOST", price="1.0000", currency="EUR", time="2024-12-24T15:00:00+00:00"
+        )
+
+        with (
+            patch.object(
+                yahoo_finance_service, "_fetch_quote_records", return_value=records
+            ) as mock_records,
+            patch.object(yahoo_finance_service, "get_quote", return_value=fallback) as mock_quote,
+        ):
+            results, errors = await yahoo_finance_service.batch_get_quotes(
+                ["aapl", "VWRA.L", "GHOST"]
+            )
+
+        mock_records.assert_called_once_with(["aapl", "VWRA.L", "GHOST"])
+        # Only the symbol without a usable bulk price goes through get_quote
+        mock_quote.assert_called_once_with("GHOST")
+        assert [(q.symbol, q.price) for q in results] == [
+            ("aapl", "195.5000"),
+            ("VWRA.L", "120.2500"),
+            ("GHOST", "1.0000"),
+        ]
+        assert errors == []
+
+    def test_probe_suffixes_uses_one_bulk_request(self):
+        records = [
+            {"symbol": "VWRA.L", "regularMarketPrice": 120.25, "longName": "Vanguard FTSE"},
+            {"symbol": "VWRA.AS", "regularMarketPrice": 110.0, "longName": "Vanguard FTSE"},
+        ]
+
+        with (
+            patch.object(
+                yahoo_finance_service, "_fetch_quote_records", return_value=records
+            ) as mock_records,
+            patch.object(yahoo_finance_service, "_get_symbol_info") as mock_info,
+        ):
+            result = yahoo_finance_service._probe_suffixes("IE00BK5BQT80", "VWRA", "VWRA.DE", {})
+
+        mock_records.assert_called_once()
+        assert "VWRA.DE" not in mock_records.call_args.args[0]
+        mock_info.assert_not_called()
+        # Priority follows FALLBACK_SUFFIXES (.L before .AS)
+        assert result.symbol == "VWRA.L"
+        assert result.name == "Vanguard FTSE"
+
+    async def test_coalesce_shares_concurrent_lookups(self):
+        from src.services.yahoo_finance import _inflight, coalesce
+
+        calls = []
+
+        def slow_lookup(key):
+            calls.append(key)
+            time.sleep(0.05)
+            return f"result-{key}"
+
+        results = await asyncio.gather(
+            *(coalesce(("quote", "AAPL"), slow_lookup, "AAPL") for _ in range(5)),
+            coalesce(("quote", "MSFT"), slow_lookup, "MSFT"),
+        )
+
+        assert results == ["result-AAPL"] * 5 + ["result-MSFT"]
+        assert sorted(calls) == ["AAPL", "MSFT"]
+        assert _inflight == {}
+
+    def test_is_valid_price(self):
+        from src.services.yahoo_finance import _is_valid_price
+
+        assert _is_valid_price(195.5)
+        assert _is_valid_price("1.5")
+        for price in (None, float("nan"), 0, -1.0, "n/a"):
+            assert not _is_valid_price(price)